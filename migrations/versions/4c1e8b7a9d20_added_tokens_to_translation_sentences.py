@@ -0,0 +1,61 @@
+"""Added normalized name and tokens to translation_sentences
+
+Revision ID: 4c1e8b7a9d20
+Revises: aaedd3ccd168
+Create Date: 2026-10-18 10:12:41.218334
+
+"""
+import string
+from typing import List, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e8b7a9d20'
+down_revision: Union[str, None] = 'aaedd3ccd168'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+translation_sentences = sa.table(
+    'translation_sentences',
+    sa.column('id', postgresql.UUID(as_uuid=True)),
+    sa.column('name', sa.String()),
+    sa.column('normalized_name', sa.String()),
+    sa.column('tokens', postgresql.ARRAY(sa.String())),
+)
+
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def normalize_sentence(text: str) -> str:
+    return text.translate(PUNCTUATION_TABLE).lower()
+
+
+def tokenize_sentence(text: str) -> List[str]:
+    return text.translate(PUNCTUATION_TABLE).split()
+
+
+def upgrade() -> None:
+    op.add_column('translation_sentences', sa.Column('normalized_name', sa.String(), nullable=True))
+    op.add_column('translation_sentences', sa.Column('tokens', postgresql.ARRAY(sa.String()), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(translation_sentences.c.id, translation_sentences.c.name)).all()
+    if rows:
+        connection.execute(
+            translation_sentences.update()
+            .where(translation_sentences.c.id == sa.bindparam('sentence_id'))
+            .values(normalized_name=sa.bindparam('normalized'), tokens=sa.bindparam('sentence_tokens')),
+            [{'sentence_id': sentence_id, 'normalized': normalize_sentence(name),
+              'sentence_tokens': tokenize_sentence(name)} for sentence_id, name in rows]
+        )
+
+    op.alter_column('translation_sentences', 'normalized_name', existing_type=sa.String(), nullable=False)
+    op.alter_column('translation_sentences', 'tokens', existing_type=postgresql.ARRAY(sa.String()), nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('translation_sentences', 'tokens')
+    op.drop_column('translation_sentences', 'normalized_name')
@@ -0,0 +1,32 @@
+"""Added username search indexes
+
+Revision ID: 7d3f2a91c6e4
+Revises: 4c1e8b7a9d20
+Create Date: 2026-10-18 14:05:12.604127
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f2a91c6e4'
+down_revision: Union[str, None] = '4c1e8b7a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_users_username_prefix', 'users', [sa.text('lower(username) text_pattern_ops')])
+    op.create_index('ix_users_username_trgm', 'users', [sa.text('lower(username) gin_trgm_ops')],
+                    postgresql_using='gin')
+    op.create_index('ix_users_first_name_trgm', 'users', [sa.text('lower(first_name) gin_trgm_ops')],
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_first_name_trgm', table_name='users')
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_username_prefix', table_name='users')
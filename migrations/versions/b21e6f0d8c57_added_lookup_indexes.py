@@ -0,0 +1,72 @@
+"""Added lookup indexes
+
+Revision ID: b21e6f0d8c57
+Revises: 7d3f2a91c6e4
+Create Date: 2026-10-18 15:32:47.118904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b21e6f0d8c57'
+down_revision: Union[str, None] = '7d3f2a91c6e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_REFERENCES = (
+    ('exams', 'user_id'),
+    ('favorite_words', 'user_id'),
+    ('competitions_rooms', 'owner_id'),
+    ('competition_room_data', 'user_id'),
+)
+
+
+def merge_duplicate_users() -> None:
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_users ON COMMIT DROP AS
+        SELECT id, survivor_id
+        FROM (SELECT id, min(id) OVER (PARTITION BY telegram_id) AS survivor_id FROM users) AS users_by_telegram_id
+        WHERE id <> survivor_id
+    """)
+    for table, column in USER_REFERENCES:
+        op.execute(f"""
+            UPDATE {table} SET {column} = duplicate_users.survivor_id
+            FROM duplicate_users
+            WHERE {table}.{column} = duplicate_users.id
+        """)
+    op.execute("""
+        DELETE FROM favorite_words
+        USING favorite_words AS kept
+        WHERE favorite_words.user_id = kept.user_id
+          AND favorite_words.word_id = kept.word_id
+          AND favorite_words.id > kept.id
+          AND favorite_words.user_id IN (SELECT survivor_id FROM duplicate_users)
+    """)
+    op.execute("DELETE FROM users USING duplicate_users WHERE users.id = duplicate_users.id")
+
+
+def upgrade() -> None:
+    merge_duplicate_users()
+    op.create_unique_constraint('uq_users_telegram_id', 'users', ['telegram_id'])
+    op.create_index('ix_translation_words_word_id', 'translation_words', ['word_id'])
+    op.create_index('ix_translation_sentences_sentence_id', 'translation_sentences', ['sentence_id'])
+    op.create_index('ix_favorite_words_user_id_word_id', 'favorite_words', ['user_id', 'word_id'])
+    op.create_index('ix_competition_room_data_competition_id_user_id_user_status', 'competition_room_data',
+                    ['competition_id', 'user_id', 'user_status'])
+    op.create_index('ix_competition_room_data_user_id_user_status', 'competition_room_data',
+                    ['user_id', 'user_status'])
+    op.create_index('ix_exams_user_id_status', 'exams', ['user_id', 'status'])
+    op.create_index('ix_words_language_id_level', 'words', ['language_id', 'level'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_words_language_id_level', table_name='words')
+    op.drop_index('ix_exams_user_id_status', table_name='exams')
+    op.drop_index('ix_competition_room_data_user_id_user_status', table_name='competition_room_data')
+    op.drop_index('ix_competition_room_data_competition_id_user_id_user_status', table_name='competition_room_data')
+    op.drop_index('ix_favorite_words_user_id_word_id', table_name='favorite_words')
+    op.drop_index('ix_translation_sentences_sentence_id', table_name='translation_sentences')
+    op.drop_index('ix_translation_words_word_id', table_name='translation_words')
+    op.drop_constraint('uq_users_telegram_id', 'users', type_='unique')
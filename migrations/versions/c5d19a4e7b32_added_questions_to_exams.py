@@ -0,0 +1,26 @@
+"""Added questions to exams
+
+Revision ID: c5d19a4e7b32
+Revises: b21e6f0d8c57
+Create Date: 2026-10-18 19:04:12.532871
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d19a4e7b32'
+down_revision: Union[str, None] = 'b21e6f0d8c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('exams', sa.Column('questions', postgresql.ARRAY(sa.String()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('exams', 'questions')
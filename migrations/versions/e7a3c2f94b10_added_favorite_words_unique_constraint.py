@@ -0,0 +1,33 @@
+"""Added favorite words unique constraint
+
+Revision ID: e7a3c2f94b10
+Revises: c5d19a4e7b32
+Create Date: 2026-10-18 21:12:05.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c2f94b10'
+down_revision: Union[str, None] = 'c5d19a4e7b32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM favorite_words
+        USING favorite_words AS kept
+        WHERE favorite_words.user_id = kept.user_id
+          AND favorite_words.word_id = kept.word_id
+          AND favorite_words.id > kept.id
+    """)
+    op.create_unique_constraint('uq_favorite_words_user_id_word_id', 'favorite_words', ['user_id', 'word_id'])
+    op.drop_index('ix_favorite_words_user_id_word_id', table_name='favorite_words')
+
+
+def downgrade() -> None:
+    op.create_index('ix_favorite_words_user_id_word_id', 'favorite_words', ['user_id', 'word_id'])
+    op.drop_constraint('uq_favorite_words_user_id_word_id', 'favorite_words', type_='unique')
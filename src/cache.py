@@ -0,0 +1,171 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+import redis.asyncio as redis
+from fastapi.encoders import jsonable_encoder
+
+from src.database import get_redis
+from src.serialization import dumps, get_type_adapter, loads
+
+CACHE_TAGS_KEY = "cache_tags"
+
+request_cache: ContextVar[Optional[dict]] = ContextVar("request_cache", default=None)
+
+
+class LRUCache:
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None or (item[1] is not None and item[1] < time.monotonic()):
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class CacheRedisService:
+
+    def __init__(self, redis_client: redis.Redis, local_maxsize: int = 256, local_ttl: float = 30,
+                 tag_versions_ttl: float = 5):
+        self.redis = redis_client
+        self.local = LRUCache(local_maxsize, local_ttl)
+        self.local_tag_versions = LRUCache(local_maxsize, tag_versions_ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_cached_value(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        raw_value = await self.redis.get(key)
+        if raw_value is None:
+            return None
+        value = loads(raw_value)
+        self.local.set(key, value)
+        return value
+
+    async def set_cached_value(self, key: str, data: Any, expire: int = 3600) -> None:
+        await self.redis.set(key, dumps(data), ex=expire)
+        self.local.set(key, data, min(expire, self.local.ttl))
+
+    async def get_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], expire: int = 3600) -> Any:
+        value = await self.get_cached_value(key)
+        if value is not None:
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            await self.set_cached_value(key, value, expire)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self.local.invalidate(key)
+        await self.redis.delete(*keys)
+
+    async def tag_versions(self, tags: List[str]) -> List[str]:
+        versions = {tag: self.local_tag_versions.get(tag) for tag in tags}
+        missing = [tag for tag, version in versions.items() if version is None]
+        if missing:
+            for tag, version in zip(missing, await self.redis.hmget(CACHE_TAGS_KEY, missing)):
+                versions[tag] = version.decode() if version else "0"
+                self.local_tag_versions.set(tag, versions[tag])
+        return [versions[tag] for tag in tags]
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.hincrby(CACHE_TAGS_KEY, tag, 1)
+            versions = await pipe.execute()
+        for tag, version in zip(tags, versions):
+            self.local_tag_versions.set(tag, str(version))
+
+
+class RequestCacheMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = request_cache.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_cache.reset(token)
+
+
+cache_service = CacheRedisService(get_redis())
+
+
+async def invalidate_tags(*tags: str) -> None:
+    await cache_service.invalidate_tags(*tags)
+
+
+def cached(key: Callable[..., Any], ttl: int = 3600,
+           tags: Union[Iterable[str], Callable[..., Iterable[str]]] = (), model: Any = None):
+    adapter = get_type_adapter(model) if model is not None else None
+
+    def decorator(func):
+        async def load(*args, **kwargs) -> Any:
+            result = await func(*args, **kwargs)
+            if adapter is None:
+                return jsonable_encoder(result)
+            return adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = f"cache:{func.__qualname__}:{key(*args, **kwargs)}"
+            cache_tags = list(tags(*args, **kwargs) if callable(tags) else tags)
+            if cache_tags:
+                cache_key = f"{cache_key}:{'.'.join(await cache_service.tag_versions(cache_tags))}"
+            value = await cache_service.get_or_set(cache_key, lambda: load(*args, **kwargs), ttl)
+            return value if adapter is None else adapter.validate_python(value)
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy import DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models import Base
@@ -30,3 +30,9 @@ class CompetitionRoomData(Base):
 
     competition: Mapped["CompetitionRoom"] = relationship(back_populates="competition_room_data")
     user: Mapped["User"] = relationship(back_populates="competition_room_data")
+
+    __table_args__ = (
+        Index("ix_competition_room_data_competition_id_user_id_user_status",
+              "competition_id", "user_id", "user_status"),
+        Index("ix_competition_room_data_user_id_user_status", "user_id", "user_status"),
+    )
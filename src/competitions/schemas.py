@@ -1,5 +1,5 @@
 import uuid
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -14,6 +14,7 @@ class CompetitionAnswerSchema(BaseModel):
     user_word_id: uuid.UUID
     telegram_id: int
     room_id: int
+    token: Optional[str] = None
 
 
 class CompetitionSchema(BaseModel):
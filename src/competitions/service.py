@@ -1,6 +1,5 @@
 import asyncio
-import json
-from typing import Sequence
+from typing import Any, Callable, Sequence
 
 import redis.asyncio as redis
 from aiogram import Bot
@@ -9,11 +8,14 @@ from fastapi import HTTPException
 from fastapi.websockets import WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import User
-from ..quizzes.query import get_translation_words
+from ..cache import cached, invalidate_tags
+from ..quizzes.cache import get_cached_translation
 from ..quizzes.schemas import RandomWordResponse
 from ..quizzes.service import QuizResponseService, WordService
-from ..users.query import get_user_by_telegram_id
+from ..quizzes.tokens import check_exercise_token
+from ..serialization import dumps, loads
+from ..users.cache import get_user_profile
+from ..users.schemas import UserProfile
 from ..utils import commit_changes_or_rollback
 from .models import CompetitionRoom, CompetitionRoomData
 from .query import (get_all_users_stats, get_competition, get_room_data,
@@ -23,8 +25,12 @@ from .schemas import CompetitionAnswerSchema, CompetitionRoomSchema, Competition
 
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(self, encoder: Callable[[Any], str] = dumps):
         self.websockets = {}
+        self.encoder = encoder
+
+    def encode(self, message: Any) -> str:
+        return message if isinstance(message, str) else self.encoder(message)
 
     async def add_connection(self, telegram_id: int, websocket: WebSocket) -> None:
         self.websockets[telegram_id] = websocket
@@ -34,21 +40,23 @@ class WebSocketManager:
         await RoomService.change_user_status(telegram_id, "offline", session)
         await room_manager.remove_user_from_room(telegram_id, self, session)
 
-    async def room_broadcast_message(self, room_id: int, message: str, room_manager: "RoomManager") -> None:
+    async def room_broadcast_message(self, room_id: int, message: Any, room_manager: "RoomManager") -> None:
         telegram_ids = await room_manager.get_users_in_room(room_id)
+        message = self.encode(message)
         for telegram_id in telegram_ids:
             websocket = self.websockets.get(int(telegram_id))
             if websocket:
                 await websocket.send_text(message)
 
-    async def notify_all_users(self, message: str) -> None:
-        for websocket in self.websockets.values():
+    async def notify_all_users(self, message: Any) -> None:
+        message = self.encode(message)
+        for websocket in list(self.websockets.values()):
             await websocket.send_text(message)
 
     async def notify_user(self, telegram_id: int, room_id: int):
         if telegram_id in self.websockets:
             message = await MessageService.create_invite_to_room_message(room_id)
-            await self.websockets[telegram_id].send_text(json.dumps(message))
+            await self.websockets[telegram_id].send_text(self.encode(message))
 
 
 class RoomManager:
@@ -57,6 +65,7 @@ class RoomManager:
         self.redis = redis_client
 
     @staticmethod
+    @cached(key=lambda session: "all", ttl=60, tags=("rooms",))
     async def get_rooms_list(session: AsyncSession) -> list:
         async with session:
             rooms = await get_rooms(session)
@@ -71,10 +80,11 @@ class RoomManager:
             self, room_data: CompetitionSchema, websocket_manager: WebSocketManager, session: AsyncSession
     ) -> None:
         async with session as session:
-            user = await get_user_by_telegram_id(session, room_data.telegram_id)
+            user = await get_user_profile(session, room_data.telegram_id)
             new_room = CompetitionRoom(owner_id=user.id, **room_data.dict(exclude={"telegram_id"}))
             session.add(new_room)
             await commit_changes_or_rollback(session, "Ошибка при создании комнаты")
+            await invalidate_tags("rooms")
             await websocket_manager.notify_all_users(MessageService.create_new_room_message(new_room, user))
 
     async def add_user_to_room(self, telegram_id: int, room_id: int) -> None:
@@ -88,10 +98,10 @@ class RoomManager:
             room_id = await self.redis.hget("user_room_map", str(telegram_id))
             if not room_id:
                 return
-            user = await get_user_by_telegram_id(session, telegram_id)
+            user = await get_user_profile(session, telegram_id)
             room_data = await get_room_data(int(room_id), session)
             await websocket_manager.notify_all_users(
-                json.dumps(await MessageService.create_user_move_message("leave", user, room_data, session))
+                await MessageService.create_user_move_message("leave", user, room_data, session)
             )
         await self.redis.srem(f"room:{int(room_id)}", telegram_id)
         await self.redis.hdel("user_room_map", str(telegram_id))
@@ -112,14 +122,14 @@ class RoomService:
     ):
         async with self.session as session:
             telegram_id, room_id = room_data.telegram_id, room_data.room_id
-            user = await get_user_by_telegram_id(session, telegram_id)
+            user = await get_user_profile(session, telegram_id)
             room_data = await get_room_data(room_id, session)
             user_room_data = await get_user_room_data(room_id, user.id, session)
 
             if action == "join":
                 return await self.user_join(
-                    room_id, telegram_id, user.id, user_room_data, room_manager, session, websocket_manager,
-                    redis_client
+                    room_id, telegram_id, user, user_room_data, room_manager, session, websocket_manager,
+                    redis_client, room_data
                 )
 
             elif action == "leave":
@@ -127,33 +137,32 @@ class RoomService:
                     room_id, telegram_id, user_room_data, room_manager, websocket_manager, user, room_data, session
                 )
 
-    async def user_join(self, room_id: int, telegram_id: int, user_id: int, user_room_data: CompetitionRoomData,
+    async def user_join(self, room_id: int, telegram_id: int, user: UserProfile, user_room_data: CompetitionRoomData,
                         room_manager: RoomManager, session: AsyncSession, websocket_manager: WebSocketManager,
-                        redis_client: redis
+                        redis_client: redis, room_data: CompetitionRoom
                         ):
-        room_data = await get_room_data(room_id, self.session)
-        user = await get_user_by_telegram_id(self.session, telegram_id)
-        await self.__change_user_status_to_online(room_id, user_id, user_room_data)
+        await self.__change_user_status_to_online(room_id, user.id, user_room_data)
         await room_manager.add_user_to_room(telegram_id, room_id)
         message_for_users = await MessageService.create_user_move_message("join", user, room_data, session)
-        await websocket_manager.notify_all_users(json.dumps(message_for_users))
+        await websocket_manager.notify_all_users(message_for_users)
         current_question = await CompetitionService.get_current_question(room_id, redis_client)
         message_for_users["current_question"] = current_question
         return message_for_users
 
     async def user_leave(
             self, room_id: int, telegram_id: int, user_room_data: CompetitionRoomData, room_manager: RoomManager,
-            websocket_manager: WebSocketManager, user: User, room_data: CompetitionRoom, session: AsyncSession
+            websocket_manager: WebSocketManager, user: UserProfile, room_data: CompetitionRoom, session: AsyncSession
     ):
         await self.__change_user_status_to_offline(user_room_data)
         await room_manager.remove_user_from_room(telegram_id, websocket_manager, self.session, room_id)
         message_for_users = await MessageService.create_user_move_message("leave", user, room_data, session)
-        await websocket_manager.notify_all_users(json.dumps(message_for_users))
+        await websocket_manager.notify_all_users(message_for_users)
 
     async def __change_user_status_to_offline(self, user_room_data: CompetitionRoomData) -> None:
         async with self.session as session:
             user_room_data.user_status = "offline"
             await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
+            await invalidate_tags("rooms")
 
     async def __change_user_status_to_online(self, room_id: int, user_id: int,
                                              user_room_data: CompetitionRoomData) -> None:
@@ -163,12 +172,14 @@ class RoomService:
             else:
                 user_room_data.user_status = "online"
                 await commit_changes_or_rollback(session, "Ошибка при подключении в комнату")
+                await invalidate_tags("rooms")
 
     async def __create_user_room_data(self, room_id: int, user_id: int) -> None:
         async with self.session as session:
             new_user_room_data = CompetitionRoomData(competition_id=room_id, user_id=user_id, user_status="online")
             session.add(new_user_room_data)
             await commit_changes_or_rollback(session, "Ошибка при подключении в комнату")
+            await invalidate_tags("rooms")
 
     @staticmethod
     async def send_invite(telegram_id: int, room_id: int, bot: Bot, websocket_manager: WebSocketManager):
@@ -186,11 +197,12 @@ class RoomService:
     @staticmethod
     async def change_user_status(telegram_id: int, status: str, session: AsyncSession) -> None:
         async with session:
-            user = await get_user_by_telegram_id(session, telegram_id)
+            user = await get_user_profile(session, telegram_id)
             user_rooms_data = await get_user_rooms_data(user.id, session)
             for room in user_rooms_data:
                 room.user_status = status
             await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
+            await invalidate_tags("rooms")
 
     @staticmethod
     async def change_status_room_to_active(room_id: int, session: AsyncSession):
@@ -199,6 +211,7 @@ class RoomService:
             return False
         competition_room.status = "active"
         await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
+        await invalidate_tags("rooms")
         return True
 
 
@@ -218,7 +231,7 @@ class CompetitionService:
                 return error_response
             room_data = await get_competition(room_id, session)
             response = await CompetitionService.prepare_competition_words(room_data, session, redis_client)
-            await websocket_manager.room_broadcast_message(room_id, response.json(), room_manager)
+            await websocket_manager.room_broadcast_message(room_id, response, room_manager)
 
     @staticmethod
     async def prepare_competition_words(
@@ -267,7 +280,7 @@ class CompetitionService:
     ):
         response = await ResponseCompetitionsService.create_competition_answer_response(
             answer_data, result, users_stats, self.session)
-        await websocket_manager.room_broadcast_message(answer_data.room_id, response.json(), room_manager)
+        await websocket_manager.room_broadcast_message(answer_data.room_id, response, room_manager)
 
     async def send_new_question(
             self, answer_data: CompetitionAnswerSchema, websocket_manager: WebSocketManager, room_manager: RoomManager,
@@ -278,23 +291,28 @@ class CompetitionService:
         new_question = await ResponseCompetitionsService.create_new_questions_response(
             answer_data, self.session, redis_client
         )
-        await websocket_manager.room_broadcast_message(answer_data.room_id, new_question.json(), room_manager)
+        await websocket_manager.room_broadcast_message(answer_data.room_id, new_question, room_manager)
 
     async def __check_answer(self, answer_data: CompetitionAnswerSchema) -> bool:
+        token_result = check_exercise_token(
+            answer_data.token, answer_data.word_for_translate_id, str(answer_data.user_word_id)
+        )
+        if token_result is not None:
+            return token_result
         async with self.session as session:
-            translation_word = await get_translation_words(session, answer_data.word_for_translate_id)
+            translation_word = await get_cached_translation(session, answer_data.word_for_translate_id)
             return answer_data.user_word_id == translation_word.id
 
     async def __update_user_statistics(self, answer_data: CompetitionAnswerSchema, result: bool) -> None:
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, answer_data.telegram_id)
+            user = await get_user_profile(session, answer_data.telegram_id)
             await self.__update_competition_statistics(user, answer_data.room_id, result)
 
     async def get_users_stats(self, room_id: int) -> Sequence[CompetitionRoomData]:
         async with self.session as session:
             return await get_all_users_stats(room_id, session)
 
-    async def __update_competition_statistics(self, user: User, room_id: int, result: bool) -> None:
+    async def __update_competition_statistics(self, user: UserProfile, room_id: int, result: bool) -> None:
         async with self.session as session:
             user_room_data = await get_user_room_data(room_id, user.id, session)
             user_room_data.user_points += 10 if result else -10
@@ -302,7 +320,7 @@ class CompetitionService:
 
     @staticmethod
     async def save_current_question(room_id, current_question: RandomWordResponse, redis_client: redis.Redis):
-        await redis_client.hset("room_question", room_id, current_question.json())
+        await redis_client.hset("room_question", room_id, dumps(current_question))
 
     @staticmethod
     async def remove_current_answer(room_id, redis_client: redis.Redis):
@@ -313,7 +331,7 @@ class CompetitionService:
         current_question = await redis_client.hget("room_question", room_id)
         if not current_question:
             return None
-        return json.loads(current_question)
+        return loads(current_question)
 
 
 class MessageService:
@@ -328,7 +346,7 @@ class MessageService:
 
     @staticmethod
     async def create_user_move_message(
-            action: str, user: User, room_data: CompetitionRoom, session: AsyncSession
+            action: str, user: UserProfile, room_data: CompetitionRoom, session: AsyncSession
     ) -> dict:
         users_count = await get_users_count_in_room(room_data.id, session)
         users_stats = await get_all_users_stats(room_data.id, session)
@@ -345,19 +363,19 @@ class MessageService:
         }
 
     @staticmethod
-    def create_new_room_message(room: CompetitionRoom, user: User) -> str:
-        return json.dumps({
+    def create_new_room_message(room: CompetitionRoom, user: UserProfile) -> dict:
+        return {
             "type": "created_new_room",
             "room_data": {
                 "room_id": room.id, "owner": user.username,
                 "language_from_id": room.language_from_id,
                 "language_to_id": room.language_to_id
             }
-        })
+        }
 
     @staticmethod
     def create_competition_answer_message(
-            user: User, result: bool, answer_data: CompetitionAnswerSchema, translation_word_id: int,
+            user: UserProfile, result: bool, answer_data: CompetitionAnswerSchema, translation_word_id: int,
             users_stats: Sequence[CompetitionRoomData]
     ):
         response_data = {
@@ -381,8 +399,8 @@ class ResponseCompetitionsService:
             answer_data: CompetitionAnswerSchema, result: bool,
             users_stats: Sequence[CompetitionRoomData], session: AsyncSession):
         async with session:
-            user = await get_user_by_telegram_id(session, answer_data.telegram_id)
-            translation_word = await get_translation_words(session, answer_data.word_for_translate_id)
+            user = await get_user_profile(session, answer_data.telegram_id)
+            translation_word = await get_cached_translation(session, answer_data.word_for_translate_id)
 
             response_data = MessageService.create_competition_answer_message(
                 user, result, answer_data, translation_word.id, users_stats
@@ -10,3 +10,4 @@ DB_NAME = os.environ.get("POSTGRES_DB")
 DB_USER = os.environ.get("POSTGRES_USER")
 DB_PASS = os.environ.get("POSTGRES_PASSWORD")
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+EXERCISE_TOKEN_SECRET = os.environ.get("EXERCISE_TOKEN_SECRET") or BOT_TOKEN
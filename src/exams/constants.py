@@ -0,0 +1,2 @@
+EXAM_TOTAL_EXERCISES = 50
+EXAM_ATTEMPTS = 3
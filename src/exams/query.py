@@ -1,4 +1,6 @@
-from sqlalchemy import and_, select
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Integer, and_, column, func, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Exam
@@ -8,3 +10,34 @@ async def get_user_exam(session: AsyncSession, user_id: int):
     query = select(Exam).where(and_(Exam.user_id == user_id, Exam.status == "started"))
     user_exam = await session.scalar(query)
     return user_exam
+
+
+async def update_exams_progress(session: AsyncSession, states: Iterable) -> None:
+    rows = [(state.id, state.progress, state.attempts) for state in states]
+    if not rows:
+        return
+    data = values(column("id", Integer), column("progress", Integer), column("attempts", Integer),
+                  name="states").data(rows)
+    query = (update(Exam)
+             .where(and_(Exam.id == data.c.id,
+                         Exam.status == "started",
+                         Exam.progress <= data.c.progress,
+                         Exam.attempts >= data.c.attempts))
+             .values(progress=data.c.progress, attempts=data.c.attempts, updated_at=func.now())
+             .execution_options(synchronize_session=False))
+    await session.execute(query)
+
+
+async def set_exam_questions(session: AsyncSession, exam_id: int, questions: List[str]) -> None:
+    query = update(Exam).where(Exam.id == exam_id).values(questions=questions).execution_options(
+        synchronize_session=False)
+    await session.execute(query)
+
+
+async def finish_exam(session: AsyncSession, state) -> Optional[int]:
+    query = (update(Exam)
+             .where(and_(Exam.id == state.id, Exam.status == "started"))
+             .values(progress=state.progress, attempts=state.attempts, status=state.status, updated_at=func.now())
+             .returning(Exam.id)
+             .execution_options(synchronize_session=False))
+    return await session.scalar(query)
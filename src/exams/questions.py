@@ -0,0 +1,55 @@
+import hmac
+import random
+import uuid
+from typing import List, NamedTuple
+
+from fastapi import HTTPException
+
+from src.quizzes.constants import ExerciseType
+from src.quizzes.pool import BasePool, sentence_pool, word_pool
+from src.quizzes.tokens import answer_digest
+
+QUESTION_TYPES = {"w": ExerciseType.word, "s": ExerciseType.sentence}
+
+
+class ExamQuestion(NamedTuple):
+    type: ExerciseType
+    subject_id: uuid.UUID
+    digest: str
+
+    @classmethod
+    def parse(cls, question: str) -> "ExamQuestion":
+        prefix, subject_id, digest = question.split(":")
+        return cls(QUESTION_TYPES[prefix], uuid.UUID(subject_id), digest)
+
+    def check(self, answer: str) -> bool:
+        return hmac.compare_digest(self.digest, answer_digest(self.subject_id, answer))
+
+
+def sample_subjects(pool: BasePool, language_from_id: int, k: int) -> list:
+    items = pool.random_items(language_from_id, k)
+    if items and len(items) < k:
+        items.extend(random.choices(items, k=k - len(items)))
+    return items
+
+
+def generate_exam_questions(language_from_id: int, count: int) -> List[str]:
+    planned = [random.choice(tuple(QUESTION_TYPES)) for _ in range(count)]
+    words = sample_subjects(word_pool, language_from_id, planned.count("w"))
+    sentences = sample_subjects(sentence_pool, language_from_id, planned.count("s"))
+    if len(words) < planned.count("w"):
+        raise HTTPException(status_code=404, detail="Слова для перевода не найдены")
+    if len(sentences) < planned.count("s"):
+        raise HTTPException(status_code=404, detail="Предложения для перевода не найдены")
+
+    words_iter, sentences_iter = iter(words), iter(sentences)
+    questions = []
+    for prefix in planned:
+        if prefix == "w":
+            word = next(words_iter)
+            subject_id, answer = word.id, str(word.translation.id)
+        else:
+            sentence = next(sentences_iter)
+            subject_id, answer = sentence.id, sentence.normalized_name
+        questions.append(f"{prefix}:{subject_id}:{answer_digest(subject_id, answer)}")
+    return questions
@@ -4,6 +4,10 @@ from pydantic import BaseModel
 class ExamAnswerResponseSchema(BaseModel):
     success: bool
     message: str | None = None
+    status: str | None = None
+    user_progress: int | None = None
+    total_progress: int | None = None
+    attempts: int | None = None
 
 
 class ExamSchema(BaseModel):
@@ -1,27 +1,34 @@
-import random
 import uuid
-from typing import List
+from typing import List, Optional
 
 from fastapi import Query, HTTPException
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from src.exams.query import get_user_exam
+from src.exams.constants import EXAM_ATTEMPTS, EXAM_TOTAL_EXERCISES
+from src.exams.query import finish_exam, set_exam_questions
+from src.exams.questions import ExamQuestion, generate_exam_questions
 from src.exams.schemas import ExamAnswerResponseSchema, ExamSchema
-from src.models import TranslationWord, Exam, User
-from src.quizzes.query import get_sentence_translation
-from src.quizzes.service import SentenceService, WordService
-from src.quizzes.utils import delete_punctuation
-from src.users.query import get_user_by_telegram_id
+from src.exams.state import ExamState, exam_state_store
+from src.models import Exam, User
+from src.quizzes.constants import ExerciseType
+from src.quizzes.pool import sentence_pool, word_pool
+from src.quizzes.service import QuizResponseService, SentenceService, WordService
+from src.quizzes.utils import normalize_user_words
+from src.users.cache import get_user_profile, invalidate_user_profile
+from src.users.schemas import UserProfile
 from src.users.service import UserService
 from src.utils import commit_changes_or_rollback
+from src.words.favorites import favorite_words_store
 
 
 class ExamManager:
 
     @staticmethod
-    async def create_exam(user_id: int, session: AsyncSession):
-        user_exam = Exam(user_id=user_id)
+    async def create_exam(user_id: int, questions: List[str], session: AsyncSession):
+        user_exam = Exam(user_id=user_id, attempts=EXAM_ATTEMPTS, total_exercises=EXAM_TOTAL_EXERCISES,
+                         questions=questions)
         session.add(user_exam)
         await commit_changes_or_rollback(session, "Ошибка при создании экзамена")
         return user_exam
@@ -31,39 +38,87 @@ class ExamService:
 
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.word_service = WordService(session)
-        self.sentence_service = SentenceService(session)
-        self.exercises = [self.sentence_service.get_random_sentence,
-                          self.word_service.get_random_word]
-                          # self.word_service.get_match_words
 
     async def start_exam(self, telegram_id: int) -> ExamSchema:
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            user_exam = await get_user_exam(session, user.id)
+            user = await get_user_profile(session, telegram_id)
+            await word_pool.ensure_loaded(session)
+            await sentence_pool.ensure_loaded(session)
+            user_exam = await exam_state_store.get(session, user.id)
             if not user_exam:
-                user_exam = await ExamManager.create_exam(user.id, session)
-
-            exercise = await self.get_random_exercise(telegram_id)
-            exercise_type = exercise["type"]
-
-            response = ExamResponseService.create_exam_exercise_response(exercise_type, exercise, user_exam)
+                questions = self.generate_questions(user, EXAM_TOTAL_EXERCISES)
+                user_exam = ExamState.from_exam(await ExamManager.create_exam(user.id, questions, session))
+                await exam_state_store.save(user_exam)
+            elif not user_exam.questions:
+                questions = self.generate_questions(user, user_exam.total_exercises)
+                await set_exam_questions(session, user_exam.id, questions)
+                await commit_changes_or_rollback(session, "Ошибка при создании экзамена")
+                user_exam = user_exam._replace(questions=tuple(questions))
+                await exam_state_store.save(user_exam)
+
+            exercise = await self.get_exam_exercise(user, user_exam)
+            response = ExamResponseService.create_exam_exercise_response(exercise.type, exercise.model_dump(),
+                                                                         user_exam)
             return response
 
-    async def get_random_exercise(self, telegram_id: int) -> dict:
-        random_exercise = random.choice(self.exercises)
-        random_exercise_data = await random_exercise(telegram_id)
-        exercise = random_exercise_data.dict()
+    @staticmethod
+    def generate_questions(user: UserProfile, total_exercises: int) -> List[str]:
+        return generate_exam_questions(user.learning_language_from_id, total_exercises + EXAM_ATTEMPTS + 1)
+
+    async def get_exam_exercise(self, user: UserProfile, user_exam: ExamState):
+        question = user_exam.current_question
+        if question is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос экзамена не найден")
+        exercise = await self.build_exercise(user, question)
+        if exercise is None:
+            user_exam = await self.replace_current_question(user, user_exam)
+            exercise = await self.build_exercise(user, user_exam.current_question)
+        if exercise is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос экзамена не найден")
         return exercise
 
+    async def build_exercise(self, user: UserProfile, question: ExamQuestion):
+        if question.type == ExerciseType.word:
+            word = word_pool.get(question.subject_id)
+            if word is None:
+                return None
+            words = WordService.add_distractors(word, user.learning_language_to_id)
+            in_favorite = await favorite_words_store.contains(self.session, user.id, word.id)
+            return QuizResponseService.create_random_word_response(word, words["other_words"], in_favorite)
+        sentence = sentence_pool.get(question.subject_id)
+        if sentence is None:
+            return None
+        words_for_sentence = SentenceService.build_words_for_sentence(sentence, user.learning_language_to_id)
+        return QuizResponseService.create_random_sentence_response(sentence, words_for_sentence)
+
+    async def replace_current_question(self, user: UserProfile, user_exam: ExamState) -> ExamState:
+        questions = list(user_exam.questions)
+        questions[user_exam.question_index] = generate_exam_questions(user.learning_language_from_id, 1)[0]
+        await set_exam_questions(self.session, user_exam.id, questions)
+        await commit_changes_or_rollback(self.session, "Ошибка при обновлении экзамена")
+        user_exam = user_exam._replace(questions=tuple(questions))
+        await exam_state_store.save(user_exam, dirty=True)
+        return user_exam
+
+    async def get_current_exam(self, user_id: int, subject_id: uuid.UUID) -> ExamState:
+        user_exam = await exam_state_store.get(self.session, user_id)
+        if not user_exam:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="У пользователя нет активных экзаменов")
+        question = user_exam.current_question
+        if question is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос экзамена не найден")
+        if question.subject_id != subject_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Ответ не относится к текущему вопросу экзамена")
+        return user_exam
+
     async def check_exam_sentence_answer(self, sentence_id: uuid.UUID, telegram_id: int,
                                          user_words: List[str] = Query(...)) -> ExamAnswerResponseSchema:
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            user_exam = await get_user_exam(session, user.id)
-            sentence = await get_sentence_translation(session, sentence_id)
-            result = delete_punctuation(sentence.name).lower() == " ".join(user_words).lower()
-            response = await self.update_user_progress(result, user_exam, user)
+            user = await get_user_profile(session, telegram_id)
+            user_exam = await self.get_current_exam(user.id, sentence_id)
+            result = user_exam.current_question.check(normalize_user_words(user_words))
+            response = await self.update_user_progress(result, user, user_exam)
             return response
 
     async def check_exam_answer(
@@ -73,52 +128,44 @@ class ExamService:
             telegram_id: int,
     ) -> ExamAnswerResponseSchema:
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            user_exam = await get_user_exam(session, user.id)
-            word = await session.get(TranslationWord, user_word_id)
-            result = word_for_translate_id == word.word_id
-            response = await self.update_user_progress(result, user_exam, user)
+            user = await get_user_profile(session, telegram_id)
+            user_exam = await self.get_current_exam(user.id, word_for_translate_id)
+            result = user_exam.current_question.check(str(user_word_id))
+            response = await self.update_user_progress(result, user, user_exam)
             return response
 
-    async def update_user_progress(self, result: bool, user_exam: Exam, user: User) -> ExamAnswerResponseSchema:
-        if not user_exam:
+    async def update_user_progress(self, result: bool, user: UserProfile,
+                                   user_exam: ExamState) -> ExamAnswerResponseSchema:
+        answered_exam = await exam_state_store.apply_answer(self.session, user_exam, result)
+        if not answered_exam:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="У пользователя нет активных экзаменов")
-        if result:
-            return await self.handle_success_answer(user_exam, user)
-        else:
-            return await self.handle_wrong_answer(user_exam)
-
-    async def handle_success_answer(self, user_exam, user: User):
-        async with self.session as session:
-            if user_exam.progress == user_exam.total_exercises:
-                return await self.exam_is_complete(user_exam, user)
-            user_exam.progress += 1
-            await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
-            return ExamAnswerResponseSchema(success=True)
-
-    async def exam_is_complete(self, user_exam: Exam, user: User) -> ExamAnswerResponseSchema:
+        if answered_exam.status == "started":
+            return ExamResponseService.create_exam_answer_response(result, answered_exam)
+        try:
+            if answered_exam.status == "completed":
+                return await self.exam_is_complete(answered_exam, user)
+            return await self.exam_is_failed(answered_exam)
+        except Exception:
+            await exam_state_store.save(user_exam)
+            raise
+
+    async def exam_is_complete(self, user_exam: ExamState, user: UserProfile) -> ExamAnswerResponseSchema:
         async with self.session as session:
-            user_exam.status = "completed"
-            new_user_rating = await UserService.update_user_rating(user.rating)
-            user.rating = new_user_rating
+            if await finish_exam(session, user_exam):
+                new_user_rating = await UserService.update_user_rating(user.rating)
+                await session.execute(update(User).where(User.id == user.id).values(rating=new_user_rating))
             await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
-            response = ExamAnswerResponseSchema(success=True, message="exam is completed")
+            await exam_state_store.remove(user.id)
+            await invalidate_user_profile(user.telegram_id)
+            response = ExamResponseService.create_exam_answer_response(True, user_exam, "exam is completed")
         return response
 
-    async def handle_wrong_answer(self, user_exam):
-        async with self.session as session:
-            if user_exam.attempts == 0:
-                await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
-                return await self.exam_is_failed(user_exam)
-            user_exam.attempts -= 1
-            await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
-            return ExamAnswerResponseSchema(success=False)
-
-    async def exam_is_failed(self, user_exam: Exam) -> ExamAnswerResponseSchema:
+    async def exam_is_failed(self, user_exam: ExamState) -> ExamAnswerResponseSchema:
         async with self.session as session:
-            user_exam.status = "failed"
+            await finish_exam(session, user_exam)
             await commit_changes_or_rollback(session, "Ошибка при обновлении данных")
-            response = ExamAnswerResponseSchema(success=False, message="exam is failed")
+            await exam_state_store.remove(user_exam.user_id)
+            response = ExamResponseService.create_exam_answer_response(False, user_exam, "exam is failed")
             return response
 
 
@@ -134,3 +181,16 @@ class ExamResponseService:
             attempts=user_exam.attempts
         )
         return response
+
+    @staticmethod
+    def create_exam_answer_response(success: bool, user_exam: ExamState,
+                                    message: Optional[str] = None) -> ExamAnswerResponseSchema:
+        response = ExamAnswerResponseSchema(
+            success=success,
+            message=message,
+            status=user_exam.status,
+            user_progress=user_exam.progress,
+            total_progress=user_exam.total_exercises,
+            attempts=user_exam.attempts
+        )
+        return response
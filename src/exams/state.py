@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from typing import NamedTuple, Optional, Tuple
+
+import redis.asyncio as redis
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.database import async_session_maker, get_redis
+from src.exams.constants import EXAM_ATTEMPTS
+from src.exams.query import get_user_exam, update_exams_progress
+from src.exams.questions import ExamQuestion
+from src.models import Exam
+
+logger = logging.getLogger(__name__)
+
+EXAM_STATE_TTL = 86400
+EXAM_FLUSH_INTERVAL = 30
+EXAM_FLUSH_BATCH_SIZE = 500
+DIRTY_EXAMS_KEY = "exams:dirty"
+
+APPLY_ANSWER_SCRIPT = """
+local state = redis.call('hmget', KEYS[1], 'progress', 'attempts', 'total_exercises', 'status')
+if not state[4] then
+    return 'missing'
+end
+if state[4] ~= 'started' then
+    return 'finished'
+end
+local progress, attempts, status = tonumber(state[1]), tonumber(state[2]), 'started'
+if progress + tonumber(ARGV[3]) - attempts ~= tonumber(ARGV[2]) then
+    return 'stale'
+end
+if ARGV[1] == '1' then
+    if progress == tonumber(state[3]) then
+        status = 'completed'
+    else
+        progress = progress + 1
+    end
+elseif attempts == 0 then
+    status = 'failed'
+else
+    attempts = attempts - 1
+end
+redis.call('hset', KEYS[1], 'progress', progress, 'attempts', attempts, 'status', status)
+redis.call('expire', KEYS[1], ARGV[4])
+if status == 'started' then
+    redis.call('sadd', KEYS[2], ARGV[5])
+end
+return {progress, attempts, status}
+"""
+
+
+class ExamState(NamedTuple):
+    id: int
+    user_id: int
+    progress: int
+    attempts: int
+    total_exercises: int
+    status: str
+    questions: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_exam(cls, exam: Exam) -> "ExamState":
+        return cls(exam.id, exam.user_id, exam.progress, exam.attempts, exam.total_exercises, exam.status,
+                   tuple(exam.questions or ()))
+
+    @classmethod
+    def from_redis(cls, data: dict) -> "ExamState":
+        data = {key.decode(): value.decode() for key, value in data.items()}
+        questions = data.get("questions")
+        return cls(int(data["id"]), int(data["user_id"]), int(data["progress"]), int(data["attempts"]),
+                   int(data["total_exercises"]), data["status"], tuple(questions.split(",")) if questions else ())
+
+    def to_redis(self) -> dict:
+        return {**self._asdict(), "questions": ",".join(self.questions)}
+
+    @property
+    def question_index(self) -> int:
+        return self.progress + EXAM_ATTEMPTS - self.attempts
+
+    @property
+    def current_question(self) -> Optional[ExamQuestion]:
+        if self.question_index >= len(self.questions):
+            return None
+        return ExamQuestion.parse(self.questions[self.question_index])
+
+
+class ExamStateStore:
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._apply_answer = redis_client.register_script(APPLY_ANSWER_SCRIPT)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"exam:{user_id}"
+
+    async def get(self, session: AsyncSession, user_id: int) -> Optional[ExamState]:
+        data = await self.redis.hgetall(self._key(user_id))
+        if data:
+            return ExamState.from_redis(data)
+        user_exam = await get_user_exam(session, user_id)
+        if user_exam is None:
+            return None
+        state = ExamState.from_exam(user_exam)
+        await self.save(state)
+        return state
+
+    async def save(self, state: ExamState, dirty: bool = False) -> None:
+        key = self._key(state.user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=state.to_redis())
+            pipe.expire(key, EXAM_STATE_TTL)
+            if dirty:
+                pipe.sadd(DIRTY_EXAMS_KEY, state.user_id)
+            await pipe.execute()
+
+    async def apply_answer(self, session: AsyncSession, user_exam: ExamState, correct: bool) -> Optional[ExamState]:
+        args = [int(correct), user_exam.question_index, EXAM_ATTEMPTS, EXAM_STATE_TTL, user_exam.user_id]
+        keys = [self._key(user_exam.user_id), DIRTY_EXAMS_KEY]
+        result = await self._apply_answer(keys=keys, args=args)
+        if result == b"missing" and await self.get(session, user_exam.user_id):
+            result = await self._apply_answer(keys=keys, args=args)
+        if result == b"stale":
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ответ на этот вопрос уже принят")
+        if not isinstance(result, list):
+            return None
+        progress, attempts, exam_status = result
+        return user_exam._replace(progress=int(progress), attempts=int(attempts), status=exam_status.decode())
+
+    async def remove(self, user_id: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(user_id))
+            pipe.srem(DIRTY_EXAMS_KEY, user_id)
+            await pipe.execute()
+
+    async def flush(self) -> int:
+        user_ids = await self.redis.spop(DIRTY_EXAMS_KEY, EXAM_FLUSH_BATCH_SIZE)
+        if not user_ids:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hgetall(self._key(int(user_id)))
+            states = [ExamState.from_redis(data) for data in await pipe.execute() if data]
+        try:
+            async with async_session_maker() as session:
+                await update_exams_progress(session, states)
+                await session.commit()
+        except Exception:
+            await self.redis.sadd(DIRTY_EXAMS_KEY, *user_ids)
+            raise
+        return len(user_ids)
+
+
+exam_state_store = ExamStateStore(get_redis())
+
+
+async def flush_exam_states() -> None:
+    while await exam_state_store.flush() == EXAM_FLUSH_BATCH_SIZE:
+        pass
+
+
+async def flush_exam_states_periodically(interval: int = EXAM_FLUSH_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_exam_states()
+        except Exception:
+            logger.exception("Не удалось сохранить прогресс экзаменов")
@@ -1,15 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 
+from src.cache import RequestCacheMiddleware
 from src.competitions.router import router as competitions_router
 from src.exams.router import router as exams_router
+from src.exams.state import flush_exam_states, flush_exam_states_periodically
+from src.quizzes.pool import load_pools, refresh_pools_periodically
 from src.quizzes.router import router as quizzes_router
 from src.users.router import router as users_router
 from src.words.router import router as words_router
 
-app = FastAPI(docs_url=None, title='Learn API')
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_pools()
+    refresh_task = asyncio.create_task(refresh_pools_periodically())
+    flush_task = asyncio.create_task(flush_exam_states_periodically())
+    yield
+    refresh_task.cancel()
+    flush_task.cancel()
+    await flush_exam_states()
+
+
+app = FastAPI(docs_url=None, title='Learn API', lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.add_middleware(RequestCacheMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 from enum import Enum
+from typing import List
 
-from sqlalchemy import DateTime, ForeignKey, String, func, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -27,6 +28,16 @@ class User(Base):
     favorite_word: Mapped["FavoriteWord"] = relationship(back_populates="user")
     competition_room_data: Mapped["CompetitionRoomData"] = relationship(back_populates="user")
 
+    __table_args__ = (UniqueConstraint("telegram_id", name="uq_users_telegram_id"),)
+
+
+Index("ix_users_username_prefix", func.lower(User.username).label("username"),
+      postgresql_ops={"username": "text_pattern_ops"})
+Index("ix_users_username_trgm", func.lower(User.username).label("username"), postgresql_using="gin",
+      postgresql_ops={"username": "gin_trgm_ops"})
+Index("ix_users_first_name_trgm", func.lower(User.first_name).label("first_name"), postgresql_using="gin",
+      postgresql_ops={"first_name": "gin_trgm_ops"})
+
 
 class Sentence(Base):
     __tablename__ = 'sentences'
@@ -52,12 +63,16 @@ class TranslationSentence(Base):
         default=uuid.uuid4
     )
     name: Mapped[str]
+    normalized_name: Mapped[str]
+    tokens: Mapped[List[str]] = mapped_column(ARRAY(String))
     sentence_id: Mapped[UUID] = mapped_column(ForeignKey("sentences.id"))
     from_language_id: Mapped[int] = mapped_column(ForeignKey("languages.id"))
     to_language_id: Mapped[int] = mapped_column(ForeignKey("languages.id"))
 
     sentence: Mapped["Sentence"] = relationship(back_populates="translation")
 
+    __table_args__ = (Index("ix_translation_sentences_sentence_id", "sentence_id"),)
+
 
 class Word(Base):
     __tablename__ = 'words'
@@ -76,6 +91,8 @@ class Word(Base):
     favorite_word: Mapped["FavoriteWord"] = relationship(back_populates="word")
     # exam_question: Mapped["ExamQuestion"] = relationship(back_populates="word")
 
+    __table_args__ = (Index("ix_words_language_id_level", "language_id", "level"),)
+
 
 class TranslationWord(Base):
     __tablename__ = 'translation_words'
@@ -92,6 +109,8 @@ class TranslationWord(Base):
 
     word: Mapped["Word"] = relationship(back_populates="translation")
 
+    __table_args__ = (Index("ix_translation_words_word_id", "word_id"),)
+
 
 class Language(Base):
     __tablename__ = 'languages'
@@ -110,6 +129,8 @@ class FavoriteWord(Base):
     user: Mapped["User"] = relationship(back_populates="favorite_word")
     word: Mapped["Word"] = relationship(back_populates="favorite_word")
 
+    __table_args__ = (UniqueConstraint("user_id", "word_id", name="uq_favorite_words_user_id_word_id"),)
+
 
 class Exam(Base):
     __tablename__ = 'exams'
@@ -120,5 +141,8 @@ class Exam(Base):
     total_exercises: Mapped[int] = mapped_column(default=50)
     progress: Mapped[int] = mapped_column(default=0)
     status: Mapped[str] = mapped_column(default="started")
+    questions: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now())
+
+    __table_args__ = (Index("ix_exams_user_id_status", "user_id", "status"),)
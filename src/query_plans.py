@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import sys
+from typing import Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.competitions.models import CompetitionRoom
+from src.competitions.query import (check_user_in_room, get_all_users_stats, get_competition, get_room_data,
+                                    get_rooms, get_user_room_data, get_user_rooms_data, get_users_count_in_room)
+from src.constants import AvailableLanguages
+from src.database import engine
+from src.exams.query import get_user_exam
+from src.models import Sentence, User, Word
+from src.quizzes.query import (get_language_from, get_language_to, get_sentence, get_sentence_translation,
+                               get_translation_words, get_user_favorite_word, get_user_favorite_word_ids,
+                               get_word_with_translation)
+from src.serialization import loads
+from src.users.query import (get_online_users, get_online_users_count, get_user_by_telegram_id, get_user_data,
+                             get_users_count, get_users_count_estimate, get_users_list, search_users)
+from src.words.query import get_available_languages, get_available_part_of_speech, get_user_favorite_words
+
+QueryCheck = Callable[[AsyncSession, dict], Awaitable]
+
+QUERY_CHECKS: Dict[str, QueryCheck] = {
+    "competitions.get_room_data": lambda session, s: get_room_data(s["room_id"], session),
+    "competitions.get_user_rooms_data": lambda session, s: get_user_rooms_data(s["user_id"], session),
+    "competitions.get_user_room_data": lambda session, s: get_user_room_data(s["room_id"], s["user_id"], session),
+    "competitions.get_competition": lambda session, s: get_competition(s["room_id"], session),
+    "competitions.get_all_users_stats": lambda session, s: get_all_users_stats(s["room_id"], session),
+    "competitions.get_rooms": lambda session, s: get_rooms(session),
+    "competitions.get_users_count_in_room": lambda session, s: get_users_count_in_room(s["room_id"], session),
+    "competitions.check_user_in_room": lambda session, s: check_user_in_room(s["room_id"], session),
+    "exams.get_user_exam": lambda session, s: get_user_exam(session, s["user_id"]),
+    "quizzes.get_translation_words": lambda session, s: get_translation_words(session, s["word_id"]),
+    "quizzes.get_word_with_translation": lambda session, s: get_word_with_translation(session, s["word_id"]),
+    "quizzes.get_user_favorite_word_ids": lambda session, s: get_user_favorite_word_ids(session, s["user_id"]),
+    "quizzes.get_user_favorite_word": lambda session, s: get_user_favorite_word(
+        session, s["telegram_id"], s["word_id"]),
+    "quizzes.get_sentence": lambda session, s: get_sentence(session, s["sentence_id"]),
+    "quizzes.get_sentence_translation": lambda session, s: get_sentence_translation(session, s["sentence_id"]),
+    "quizzes.get_language_to": lambda session, s: get_language_to(session, AvailableLanguages.english),
+    "quizzes.get_language_from": lambda session, s: get_language_from(session, AvailableLanguages.russian),
+    "users.get_user_by_telegram_id": lambda session, s: get_user_by_telegram_id(session, s["telegram_id"]),
+    "users.search_users": lambda session, s: search_users(session, s["username"][:3], 20, 0),
+    "users.search_users_prefix": lambda session, s: search_users(session, s["username"][:2], 20, 0),
+    "users.get_online_users": lambda session, s: get_online_users(1, 20, session, [s["telegram_id"]]),
+    "users.get_users_list": lambda session, s: get_users_list(1, 20, session),
+    "users.get_users_list_after_id": lambda session, s: get_users_list(None, 20, session, s["user_id"]),
+    "users.get_users_count": lambda session, s: get_users_count(session),
+    "users.get_users_count_estimate": lambda session, s: get_users_count_estimate(session),
+    "users.get_online_users_count": lambda session, s: get_online_users_count([s["telegram_id"]], session),
+    "users.get_user_data": lambda session, s: get_user_data(session, s["telegram_id"]),
+    "words.get_available_languages": lambda session, s: get_available_languages(session),
+    "words.get_available_part_of_speech": lambda session, s: get_available_part_of_speech(session),
+    "words.get_user_favorite_words": lambda session, s: get_user_favorite_words(
+        session, s["user_id"], None, 21, None, None),
+}
+
+ALLOWED_SEQ_SCANS: Dict[str, set] = {
+    "competitions.get_rooms": {"competitions_rooms", "competition_room_data"},
+    "users.get_users_count": {"users"},
+    "words.get_available_part_of_speech": {"words"},
+    "words.get_available_languages": {"languages"},
+    "quizzes.get_language_to": {"languages"},
+    "quizzes.get_language_from": {"languages"},
+}
+
+
+async def get_samples(session: AsyncSession) -> dict:
+    user = (await session.execute(select(User.id, User.telegram_id, User.username).limit(1))).first()
+    word_id = await session.scalar(select(Word.id).limit(1))
+    sentence_id = await session.scalar(select(Sentence.id).limit(1))
+    room_id = await session.scalar(select(CompetitionRoom.id).limit(1))
+    if None in (user, word_id, sentence_id, room_id):
+        raise SystemExit("В базе нет пользователя, слова, предложения или комнаты для проверки запросов")
+    return {"user_id": user.id, "telegram_id": user.telegram_id, "username": user.username,
+            "word_id": word_id, "sentence_id": sentence_id, "room_id": room_id}
+
+
+def iter_seq_scans(plan: dict) -> Iterator[str]:
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from iter_seq_scans(child)
+
+
+async def explain(connection: AsyncConnection, statement: str, parameters: tuple) -> dict:
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    return (loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def check_query_plans(names: List[str]) -> List[Tuple[str, str]]:
+    failures = []
+    async with engine.connect() as connection:
+        await connection.execute(text("SET enable_seqscan = off"))
+        session = AsyncSession(bind=connection)
+        samples = await get_samples(session)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        for name in names:
+            statements.clear()
+            event.listen(connection.sync_connection, "before_cursor_execute", capture)
+            try:
+                await QUERY_CHECKS[name](session, samples)
+            finally:
+                event.remove(connection.sync_connection, "before_cursor_execute", capture)
+            for statement, parameters in statements:
+                plan = await explain(connection, statement, parameters)
+                for relation in iter_seq_scans(plan):
+                    if relation not in ALLOWED_SEQ_SCANS.get(name, set()):
+                        failures.append((name, relation))
+            status = "SEQ SCAN" if any(failure[0] == name for failure in failures) else "ok"
+            print(f"{status:8} {name}", flush=True)
+        await connection.rollback()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.query_plans",
+        description="EXPLAIN для функций */query.py на заполненной базе; ошибка, если план использует Seq Scan"
+    )
+    parser.add_argument("names", nargs="*", help="Проверить только указанные запросы")
+    args = parser.parse_args()
+    unknown = set(args.names) - set(QUERY_CHECKS)
+    if unknown:
+        parser.error(f"неизвестные запросы: {', '.join(sorted(unknown))}")
+    failures = asyncio.run(check_query_plans(args.names or list(QUERY_CHECKS)))
+    for name, relation in failures:
+        print(f"{name}: последовательное чтение таблицы {relation}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
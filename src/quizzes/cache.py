@@ -0,0 +1,21 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import LRUCache
+from src.quizzes.query import get_translation_words
+from src.schemas import WordInfo
+
+translation_cache = LRUCache(maxsize=50000, ttl=3600)
+
+
+async def get_cached_translation(session: AsyncSession, word_id: uuid.UUID) -> Optional[WordInfo]:
+    translation = translation_cache.get(word_id)
+    if translation is None:
+        translation_word = await get_translation_words(session, word_id)
+        if translation_word is None:
+            return None
+        translation = WordInfo(id=translation_word.id, name=translation_word.name)
+        translation_cache.set(word_id, translation)
+    return translation
@@ -21,3 +21,9 @@ class AvailablePartOfSpeech(str, Enum):
     numeral = "numeral"
     conjunction = "conjunction"
     other = "other"
+
+
+class ExerciseType(str, Enum):
+    word = "random_word"
+    sentence = "random_sentence"
+    match = "match_words"
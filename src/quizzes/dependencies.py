@@ -0,0 +1,8 @@
+from src.database import get_redis
+from src.quizzes.prefetch import ExerciseQueue
+
+exercise_queue = ExerciseQueue(get_redis())
+
+
+def get_exercise_queue() -> ExerciseQueue:
+    return exercise_queue
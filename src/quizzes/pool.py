@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import random
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session_maker
+from src.models import Sentence, TranslationSentence, TranslationWord, Word
+
+logger = logging.getLogger(__name__)
+
+POOL_REFRESH_INTERVAL = 600
+
+
+class PoolTranslation(NamedTuple):
+    id: uuid.UUID
+    name: str
+    word_id: uuid.UUID
+    to_language_id: int
+
+
+class PoolWord(NamedTuple):
+    id: uuid.UUID
+    name: str
+    language_id: int
+    part_of_speech: str
+    level: str
+    translation: PoolTranslation
+
+
+class PoolSentence(NamedTuple):
+    id: uuid.UUID
+    name: str
+    language_id: int
+    level: Optional[str]
+    translation: PoolTranslation
+    tokens: Tuple[str, ...]
+    normalized_name: str
+
+
+class Vocabulary:
+    def __init__(self):
+        self._sources: Dict[str, Dict[int, Set[str]]] = {}
+        self._known: Dict[int, Set[str]] = {}
+        self._tokens: Dict[int, List[str]] = {}
+
+    def replace(self, source: str, tokens_by_language: Dict[int, Set[str]]) -> None:
+        self._sources[source] = tokens_by_language
+        known = {}
+        for source_tokens in self._sources.values():
+            for language_id, tokens in source_tokens.items():
+                known.setdefault(language_id, set()).update(tokens)
+        self._known = known
+        self._tokens = {language_id: list(tokens) for language_id, tokens in known.items()}
+
+    def add(self, source: str, language_id: int, tokens: Iterable[str]) -> None:
+        source_tokens = self._sources.setdefault(source, {}).setdefault(language_id, set())
+        known = self._known.setdefault(language_id, set())
+        language_tokens = self._tokens.setdefault(language_id, [])
+        for token in tokens:
+            source_tokens.add(token)
+            if token not in known:
+                known.add(token)
+                language_tokens.append(token)
+
+    def sample(self, language_id: int, k: int, exclude: Set[str]) -> List[str]:
+        tokens = self._tokens.get(language_id, [])
+        sample = random.sample(tokens, min(k + len(exclude), len(tokens)))
+        return [token for token in sample if token not in exclude][:k]
+
+
+class BasePool(ABC):
+    def __init__(self):
+        self._items: Dict[int, list] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self.load(session)
+
+    async def load(self, session: AsyncSession) -> None:
+        items = await self._fetch(session)
+        self._build(items)
+        self._loaded = True
+
+    @abstractmethod
+    async def _fetch(self, session: AsyncSession) -> list:
+        pass
+
+    def _build(self, items: list) -> None:
+        grouped = {}
+        for item in items:
+            grouped.setdefault(item.language_id, []).append(item)
+        self._items = grouped
+
+    def add(self, item) -> None:
+        self._items.setdefault(item.language_id, []).append(item)
+
+    def random_item(self, language_id: int):
+        items = self._items.get(language_id)
+        if not items:
+            return None
+        return items[random.randrange(len(items))]
+
+    def random_items(self, language_id: int, k: int) -> list:
+        items = self._items.get(language_id, [])
+        return random.sample(items, min(k, len(items)))
+
+
+class DistractorIndex:
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, str, str], List[PoolTranslation]] = {}
+        self._by_language: Dict[int, List[PoolTranslation]] = {}
+
+    def build(self, words: List[PoolWord]) -> None:
+        buckets, by_language = {}, {}
+        for word in words:
+            self._insert(buckets, by_language, word)
+        self._buckets, self._by_language = buckets, by_language
+
+    def add(self, word: PoolWord) -> None:
+        self._insert(self._buckets, self._by_language, word)
+
+    @staticmethod
+    def _insert(buckets: dict, by_language: dict, word: PoolWord) -> None:
+        to_language_id = word.translation.to_language_id
+        buckets.setdefault((to_language_id, word.part_of_speech, word.level), []).append(word.translation)
+        by_language.setdefault(to_language_id, []).append(word.translation)
+
+    def sample(self, language_to_id: int, part_of_speech: str, level: str, exclude_word_id: uuid.UUID,
+               k: int) -> List[PoolTranslation]:
+        bucket = self._buckets.get((language_to_id, part_of_speech, level), [])
+        if len(bucket) <= k:
+            bucket = self._by_language.get(language_to_id, [])
+        sample = random.sample(bucket, min(k + 1, len(bucket)))
+        return [t for t in sample if t.word_id != exclude_word_id][:k]
+
+
+class WordPool(BasePool):
+
+    def __init__(self, vocabulary: Vocabulary):
+        super().__init__()
+        self.distractors = DistractorIndex()
+        self.vocabulary = vocabulary
+        self._by_id: Dict[uuid.UUID, PoolWord] = {}
+
+    async def _fetch(self, session: AsyncSession) -> List[PoolWord]:
+        query = (select(Word.id, Word.name, Word.language_id, Word.part_of_speech, Word.level,
+                        TranslationWord.id, TranslationWord.name, TranslationWord.to_language_id)
+                 .join(TranslationWord, TranslationWord.word_id == Word.id))
+        result = await session.execute(query)
+        return [
+            PoolWord(word_id, name, language_id, part_of_speech, level,
+                     PoolTranslation(translation_id, translation_name, word_id, to_language_id))
+            for (word_id, name, language_id, part_of_speech, level,
+                 translation_id, translation_name, to_language_id) in result.all()
+        ]
+
+    def _build(self, items: List[PoolWord]) -> None:
+        super()._build(items)
+        self.distractors.build(items)
+        self._by_id = {word.id: word for word in items}
+        tokens_by_language = {}
+        for word in items:
+            tokens_by_language.setdefault(word.translation.to_language_id, set()).add(word.translation.name)
+        self.vocabulary.replace("words", tokens_by_language)
+
+    def add(self, item: PoolWord) -> None:
+        super().add(item)
+        self.distractors.add(item)
+        self._by_id[item.id] = item
+        self.vocabulary.add("words", item.translation.to_language_id, [item.translation.name])
+
+    def get(self, word_id: uuid.UUID) -> Optional[PoolWord]:
+        return self._by_id.get(word_id)
+
+    def random_word(self, language_from_id: int) -> Optional[PoolWord]:
+        return self.random_item(language_from_id)
+
+    def random_words(self, language_from_id: int, k: int) -> List[PoolWord]:
+        return self.random_items(language_from_id, k)
+
+    def random_distractors(self, language_to_id: int, word: Union[PoolWord, Word], k: int) -> List[PoolTranslation]:
+        return self.distractors.sample(language_to_id, word.part_of_speech, word.level, word.id, k)
+
+
+class SentencePool(BasePool):
+
+    def __init__(self, vocabulary: Vocabulary):
+        super().__init__()
+        self.vocabulary = vocabulary
+        self._by_id: Dict[uuid.UUID, PoolSentence] = {}
+
+    async def _fetch(self, session: AsyncSession) -> List[PoolSentence]:
+        query = (select(Sentence.id, Sentence.name, Sentence.language_id, Sentence.level,
+                        TranslationSentence.id, TranslationSentence.name, TranslationSentence.to_language_id,
+                        TranslationSentence.tokens, TranslationSentence.normalized_name)
+                 .join(TranslationSentence, TranslationSentence.sentence_id == Sentence.id))
+        result = await session.execute(query)
+        return [
+            PoolSentence(sentence_id, name, language_id, level,
+                         PoolTranslation(translation_id, translation_name, sentence_id, to_language_id),
+                         tuple(tokens), normalized_name)
+            for (sentence_id, name, language_id, level,
+                 translation_id, translation_name, to_language_id, tokens, normalized_name) in result.all()
+        ]
+
+    def _build(self, items: List[PoolSentence]) -> None:
+        super()._build(items)
+        self._by_id = {sentence.id: sentence for sentence in items}
+        tokens_by_language = {}
+        for sentence in items:
+            tokens_by_language.setdefault(sentence.translation.to_language_id, set()).update(sentence.tokens)
+        self.vocabulary.replace("sentences", tokens_by_language)
+
+    def add(self, item: PoolSentence) -> None:
+        super().add(item)
+        self._by_id[item.id] = item
+        self.vocabulary.add("sentences", item.translation.to_language_id, item.tokens)
+
+    def get(self, sentence_id: uuid.UUID) -> Optional[PoolSentence]:
+        return self._by_id.get(sentence_id)
+
+    def random_sentence(self, language_from_id: int) -> Optional[PoolSentence]:
+        return self.random_item(language_from_id)
+
+
+vocabulary = Vocabulary()
+word_pool = WordPool(vocabulary)
+sentence_pool = SentencePool(vocabulary)
+
+
+async def load_pools() -> None:
+    async with async_session_maker() as session:
+        await word_pool.load(session)
+        await sentence_pool.load(session)
+
+
+async def refresh_pools_periodically(interval: int = POOL_REFRESH_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load_pools()
+        except Exception:
+            logger.exception("Не удалось обновить пул слов и предложений")
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+from src.database import async_session_maker
+from src.quizzes.constants import ExerciseType
+from src.quizzes.service import ExerciseBatchService
+from src.serialization import loads
+from src.users.cache import get_user_profile
+
+logger = logging.getLogger(__name__)
+
+EXERCISE_QUEUE_SIZE = 10
+EXERCISE_QUEUE_LOW_WATER = 3
+EXERCISE_QUEUE_TTL = 600
+EXERCISE_QUEUE_LOCK_TTL = 30
+
+PUSH_IF_VERSION_SCRIPT = """
+if (redis.call('get', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('rpush', KEYS[1], unpack(ARGV, 3))
+redis.call('expire', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class ExerciseQueue:
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._tasks = set()
+        self._push_if_version = redis_client.register_script(PUSH_IF_VERSION_SCRIPT)
+
+    @staticmethod
+    def _key(exercise_type: ExerciseType, telegram_id: int) -> str:
+        return f"exercise_queue:{exercise_type.value}:{telegram_id}"
+
+    @staticmethod
+    def _version_key(telegram_id: int) -> str:
+        return f"exercise_queue:version:{telegram_id}"
+
+    async def pop(self, exercise_type: ExerciseType, telegram_id: int) -> Optional[dict]:
+        key = self._key(exercise_type, telegram_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            exercise, remaining = await pipe.lpop(key).llen(key).execute()
+        if remaining < EXERCISE_QUEUE_LOW_WATER:
+            self.schedule_refill(exercise_type, telegram_id)
+        if exercise is None:
+            return None
+        return loads(exercise)
+
+    def schedule_refill(self, exercise_type: ExerciseType, telegram_id: int) -> None:
+        task = asyncio.create_task(self.refill(exercise_type, telegram_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def refill(self, exercise_type: ExerciseType, telegram_id: int) -> None:
+        key = self._key(exercise_type, telegram_id)
+        lock_key = f"{key}:lock"
+        if not await self.redis.set(lock_key, 1, nx=True, ex=EXERCISE_QUEUE_LOCK_TTL):
+            return
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                version, length = await pipe.get(self._version_key(telegram_id)).llen(key).execute()
+            missing = EXERCISE_QUEUE_SIZE - length
+            if missing <= 0:
+                return
+            async with async_session_maker() as session:
+                if await get_user_profile(session, telegram_id) is None:
+                    return
+                batch = await ExerciseBatchService(session).get_exercises(telegram_id, missing, [exercise_type])
+            await self._push_if_version(
+                keys=[key, self._version_key(telegram_id)],
+                args=[version or "0", EXERCISE_QUEUE_TTL, *[exercise.model_dump_json() for exercise in batch.exercises]]
+            )
+        except Exception:
+            logger.exception("Не удалось пополнить очередь упражнений пользователя %s", telegram_id)
+        finally:
+            await self.redis.delete(lock_key)
+
+    async def clear(self, telegram_id: int) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(self._version_key(telegram_id))
+            pipe.expire(self._version_key(telegram_id), EXERCISE_QUEUE_TTL)
+            pipe.delete(*[self._key(exercise_type, telegram_id) for exercise_type in ExerciseType])
+            await pipe.execute()
@@ -1,12 +1,19 @@
 import uuid
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
-from src.quizzes.schemas import RandomSentenceResponse, RandomWordResponse
-from src.quizzes.service import (FavoriteWordService, QuizAnswerService,
-                                 SentenceService, WordService)
+from src.quizzes.cache import translation_cache
+from src.quizzes.constants import ExerciseType
+from src.quizzes.dependencies import get_exercise_queue
+from src.quizzes.prefetch import ExerciseQueue
+from src.quizzes.schemas import (BatchExercisesResponse, CacheStatsResponse,
+                                 RandomSentenceResponse, RandomWordResponse)
+from src.quizzes.service import (ExerciseBatchService, FavoriteWordService,
+                                 QuizAnswerService, SentenceService,
+                                 WordService)
 
 router = APIRouter(
     prefix="/quiz",
@@ -15,7 +22,11 @@ router = APIRouter(
 
 
 @router.get("/random-word", response_model=RandomWordResponse)
-async def get_random_word(telegram_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_random_word(telegram_id: int, session: AsyncSession = Depends(get_async_session),
+                          exercise_queue: ExerciseQueue = Depends(get_exercise_queue)):
+    exercise = await exercise_queue.pop(ExerciseType.word, telegram_id)
+    if exercise:
+        return exercise
     word_service = WordService(session)
     response = await word_service.get_random_word(telegram_id)
     return response
@@ -28,14 +39,18 @@ async def get_random_favorite_word(telegram_id: int, session: AsyncSession = Dep
 
 
 @router.get("/check-answer", response_model=bool)
-async def check_answer(word_for_translate_id: uuid.UUID, user_word_id: uuid.UUID,
+async def check_answer(word_for_translate_id: uuid.UUID, user_word_id: uuid.UUID, token: Optional[str] = None,
                        session: AsyncSession = Depends(get_async_session)):
     answer_service = QuizAnswerService(session)
-    return await answer_service.check_answer(word_for_translate_id, user_word_id)
+    return await answer_service.check_answer(word_for_translate_id, user_word_id, token)
 
 
 @router.get("/get-random-sentence", response_model=RandomSentenceResponse)
-async def get_random_sentence(telegram_id: int, session: AsyncSession = Depends(get_async_session)):
+async def get_random_sentence(telegram_id: int, session: AsyncSession = Depends(get_async_session),
+                              exercise_queue: ExerciseQueue = Depends(get_exercise_queue)):
+    exercise = await exercise_queue.pop(ExerciseType.sentence, telegram_id)
+    if exercise:
+        return exercise
     sentence_service = SentenceService(session)
     return await sentence_service.get_random_sentence(telegram_id)
 
@@ -44,13 +59,30 @@ async def get_random_sentence(telegram_id: int, session: AsyncSession = Depends(
 async def check_sentence_answer(
         sentence_id: uuid.UUID,
         user_words: list[str] = Query(...),
+        token: Optional[str] = None,
         session: AsyncSession = Depends(get_async_session)
 ):
     answer_service = QuizAnswerService(session)
-    return await answer_service.check_sentence_answer(sentence_id, user_words)
+    return await answer_service.check_sentence_answer(sentence_id, user_words, token)
 
 
 @router.get("/match-words")
 async def get_match_words(telegram_id: int, session: AsyncSession = Depends(get_async_session)):
     word_service = WordService(session)
     return await word_service.get_match_words(telegram_id)
+
+
+@router.get("/batch", response_model=BatchExercisesResponse)
+async def get_exercises_batch(
+        telegram_id: int,
+        size: int = Query(ge=1, le=50, default=10),
+        exercise_types: List[ExerciseType] = Query(default=list(ExerciseType)),
+        session: AsyncSession = Depends(get_async_session)
+):
+    batch_service = ExerciseBatchService(session)
+    return await batch_service.get_exercises(telegram_id, size, exercise_types)
+
+
+@router.get("/translation-cache-stats", response_model=CacheStatsResponse)
+async def get_translation_cache_stats():
+    return translation_cache.stats()
@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from pydantic import UUID4, BaseModel, ConfigDict
 
@@ -16,15 +16,28 @@ class RandomWordResponse(BaseModel):
     word_for_translate: WordInfo
     other_words: List[WordInfo]
     in_favorite: Optional[bool]
+    token: Optional[str] = None
 
 
 class RandomSentenceResponse(BaseModel):
     type: str
     sentence_for_translate: SentenceInfo
     words_for_sentence: List[str]
+    token: Optional[str] = None
 
 
 class MatchWordsResponse(BaseModel):
     type: str
     words: List[WordInfo]
     translation_words: List[WordInfo]
+
+
+class BatchExercisesResponse(BaseModel):
+    exercises: List[Union[RandomWordResponse, RandomSentenceResponse, MatchWordsResponse]]
+
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
@@ -1,22 +1,24 @@
+import random
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import Query
+from fastapi import HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.quizzes.query import (get_random_sentence_for_translate,
-                               get_random_user_favorite_word,
-                               get_random_word_for_translate, get_random_words,
-                               get_random_words_for_match,
-                               get_random_words_for_sentence,
-                               get_sentence_translation, get_translation_words,
-                               get_user_favorite_words)
-from src.quizzes.schemas import (MatchWordsResponse, RandomSentenceResponse,
-                                 RandomWordResponse)
+from src.quizzes.pool import (PoolSentence, PoolWord, sentence_pool,
+                              vocabulary, word_pool)
+from src.quizzes.cache import get_cached_translation
+from src.quizzes.constants import ExerciseType
+from src.quizzes.query import get_sentence_translation, get_word_with_translation
+from src.quizzes.schemas import (BatchExercisesResponse, MatchWordsResponse,
+                                 RandomSentenceResponse, RandomWordResponse)
+from src.quizzes.tokens import check_exercise_token, create_exercise_token
 from src.quizzes.utils import (add_word_for_translate_to_other_words,
-                               delete_punctuation, shuffle_random_words)
+                               normalize_user_words, shuffle_random_words)
 from src.schemas import SentenceInfo, WordInfo
-from src.users.query import get_user_by_telegram_id
+from src.serialization import from_attributes
+from src.users.cache import get_user_profile
+from src.words.favorites import favorite_words_store
 
 
 class WordService:
@@ -27,34 +29,51 @@ class WordService:
             self,
             telegram_id: int) -> RandomWordResponse:
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
+            user = await get_user_profile(session, telegram_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Пользователь не найден")
             words = await self.get_random_words(user.learning_language_from_id, user.learning_language_to_id)
             word_for_translate = words["word_for_translate"]
-            in_favorite = await get_user_favorite_words(session, word_for_translate.id, user.id)
+            in_favorite = await favorite_words_store.contains(session, user.id, word_for_translate.id)
             response = QuizResponseService.create_random_word_response(word_for_translate, words["other_words"],
                                                                        in_favorite)
             return response
 
     async def get_random_words(self, language_from_id: int, language_to_id: int) -> dict:
-        async with self.session as session:
-            word_for_translate = await get_random_word_for_translate(session, language_from_id)
-            words = await get_random_words(session, language_to_id, word_for_translate.id)
+        await word_pool.ensure_loaded(self.session)
+        return self.sample_random_words(language_from_id, language_to_id)
+
+    @staticmethod
+    def sample_random_words(language_from_id: int, language_to_id: int) -> dict:
+        word_for_translate = word_pool.random_word(language_from_id)
+        if word_for_translate is None:
+            raise HTTPException(status_code=404, detail="Слова для перевода не найдены")
+        return WordService.add_distractors(word_for_translate, language_to_id)
 
-            add_word_for_translate_to_other_words(words, word_for_translate)
-            shuffle_random_words(words)
-            return {"other_words": words, "word_for_translate": word_for_translate}
+    @staticmethod
+    def add_distractors(word_for_translate: PoolWord, language_to_id: int) -> dict:
+        words = word_pool.random_distractors(language_to_id, word_for_translate, 2)
+
+        add_word_for_translate_to_other_words(words, word_for_translate)
+        shuffle_random_words(words)
+        return {"other_words": words, "word_for_translate": word_for_translate}
 
     async def get_match_words(self, telegram_id: int):
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            words = await get_random_words_for_match(session, user.learning_language_from_id)
-            words_list = [{"id": w.id, "name": w.name} for w in words]
-            translation_words_list = [{"id": w.translation.id, "name": w.translation.name} for w in words]
-            shuffle_random_words(words_list)
-            shuffle_random_words(translation_words_list)
-
-            response = QuizResponseService.create_match_words_response(words_list, translation_words_list)
-            return response
+            user = await get_user_profile(session, telegram_id)
+            await word_pool.ensure_loaded(session)
+            return self.sample_match_words(user.learning_language_from_id)
+
+    @staticmethod
+    def sample_match_words(language_from_id: int) -> MatchWordsResponse:
+        words = word_pool.random_words(language_from_id, 8)
+        words_list = [{"id": w.id, "name": w.name} for w in words]
+        translation_words_list = [{"id": w.translation.id, "name": w.translation.name} for w in words]
+        shuffle_random_words(words_list)
+        shuffle_random_words(translation_words_list)
+
+        response = QuizResponseService.create_match_words_response(words_list, translation_words_list)
+        return response
 
 
 class FavoriteWordService:
@@ -63,10 +82,11 @@ class FavoriteWordService:
 
     async def get_random_favorite_word(self, telegram_id: int):
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            random_user_favorite_word = await get_random_user_favorite_word(session, user.id)
-            other_words = await get_random_words(session, user.learning_language_to_id,
-                                                 random_user_favorite_word.id)
+            user = await get_user_profile(session, telegram_id)
+            await word_pool.ensure_loaded(session)
+            random_user_favorite_word = await self.get_random_user_favorite_word(session, user.id)
+            other_words = word_pool.random_distractors(user.learning_language_to_id,
+                                                       random_user_favorite_word, 2)
 
             add_word_for_translate_to_other_words(other_words, random_user_favorite_word)
             shuffle_random_words(other_words)
@@ -75,6 +95,16 @@ class FavoriteWordService:
                                                                        in_favorite=True)
             return response
 
+    @staticmethod
+    async def get_random_user_favorite_word(session: AsyncSession, user_id: int):
+        word_id = await favorite_words_store.random_word_id(session, user_id)
+        if word_id is None:
+            raise HTTPException(status_code=404, detail="У пользователя нет избранных слов")
+        word = word_pool.get(word_id) or await get_word_with_translation(session, word_id)
+        if word is None:
+            raise HTTPException(status_code=404, detail="Слово не найдено")
+        return word
+
 
 class SentenceService:
     def __init__(self, session: AsyncSession):
@@ -82,35 +112,90 @@ class SentenceService:
 
     async def get_random_sentence(self, telegram_id: int):
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, telegram_id)
-            language_to_id = user.learning_language_to_id
-            random_sentence_for_translate = await get_random_sentence_for_translate(session,
-                                                                                    user.learning_language_from_id)
-
-            words_for_sentence = delete_punctuation(random_sentence_for_translate.translation.name).split()
-            random_words_for_sentence = await get_random_words_for_sentence(session, language_to_id, words_for_sentence)
-
-            words_for_sentence.extend(random_words_for_sentence)
-            shuffle_random_words(words_for_sentence)
-
+            user = await get_user_profile(session, telegram_id)
+            await word_pool.ensure_loaded(session)
+            await sentence_pool.ensure_loaded(session)
+            random_sentence_for_translate = sentence_pool.random_sentence(user.learning_language_from_id)
+            if random_sentence_for_translate is None:
+                raise HTTPException(status_code=404, detail="Предложения для перевода не найдены")
+
+            words_for_sentence = self.build_words_for_sentence(random_sentence_for_translate,
+                                                               user.learning_language_to_id)
             response = QuizResponseService.create_random_sentence_response(random_sentence_for_translate,
                                                                            words_for_sentence)
             return response
 
+    @staticmethod
+    def build_words_for_sentence(sentence: PoolSentence, language_to_id: int) -> List[str]:
+        words_for_sentence = list(sentence.tokens)
+        words_for_sentence.extend(vocabulary.sample(language_to_id, random.randint(2, 4), set(sentence.tokens)))
+        shuffle_random_words(words_for_sentence)
+        return words_for_sentence
+
+
+class ExerciseBatchService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_exercises(self, telegram_id: int, size: int,
+                            exercise_types: List[ExerciseType]) -> BatchExercisesResponse:
+        async with self.session as session:
+            user = await get_user_profile(session, telegram_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Пользователь не найден")
+            await word_pool.ensure_loaded(session)
+            await sentence_pool.ensure_loaded(session)
+
+            planned = [random.choice(exercise_types) for _ in range(size)]
+            words = [WordService.sample_random_words(user.learning_language_from_id, user.learning_language_to_id)
+                     for exercise_type in planned if exercise_type == ExerciseType.word]
+            sentences = [sentence_pool.random_sentence(user.learning_language_from_id)
+                         for exercise_type in planned if exercise_type == ExerciseType.sentence]
+            if None in sentences:
+                raise HTTPException(status_code=404, detail="Предложения для перевода не найдены")
+
+            in_favorite_flags = await favorite_words_store.contains_many(
+                session, user.id, [w["word_for_translate"].id for w in words]
+            )
+            words_iter, sentences_iter = iter(zip(words, in_favorite_flags)), iter(sentences)
+            exercises = []
+            for exercise_type in planned:
+                if exercise_type == ExerciseType.word:
+                    word, in_favorite = next(words_iter)
+                    exercises.append(QuizResponseService.create_random_word_response(
+                        word["word_for_translate"], word["other_words"], in_favorite
+                    ))
+                elif exercise_type == ExerciseType.sentence:
+                    sentence = next(sentences_iter)
+                    words_for_sentence = SentenceService.build_words_for_sentence(sentence,
+                                                                                  user.learning_language_to_id)
+                    exercises.append(QuizResponseService.create_random_sentence_response(sentence, words_for_sentence))
+                else:
+                    exercises.append(WordService.sample_match_words(user.learning_language_from_id))
+            return BatchExercisesResponse(exercises=exercises)
+
 
 class QuizAnswerService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def check_answer(self, word_for_translate_id: uuid.UUID, user_word_id: uuid.UUID):
+    async def check_answer(self, word_for_translate_id: uuid.UUID, user_word_id: uuid.UUID,
+                           token: Optional[str] = None):
+        token_result = check_exercise_token(token, word_for_translate_id, str(user_word_id))
+        if token_result is not None:
+            return token_result
         async with self.session as session:
-            word = await get_translation_words(session, word_for_translate_id)
+            word = await get_cached_translation(session, word_for_translate_id)
             return user_word_id == word.id
 
-    async def check_sentence_answer(self, sentence_id: uuid.UUID, user_words: list[str] = Query(...), ):
+    async def check_sentence_answer(self, sentence_id: uuid.UUID, user_words: list[str] = Query(...),
+                                    token: Optional[str] = None):
+        token_result = check_exercise_token(token, sentence_id, normalize_user_words(user_words))
+        if token_result is not None:
+            return token_result
         async with self.session as session:
             sentence = await get_sentence_translation(session, sentence_id)
-            return delete_punctuation(sentence.name).lower() == " ".join(user_words).lower()
+            return sentence.normalized_name == normalize_user_words(user_words)
 
 
 class QuizResponseService:
@@ -120,9 +205,10 @@ class QuizResponseService:
                                     in_favorite: bool = None) -> RandomWordResponse:
         response = RandomWordResponse(
             type="random_word",
-            word_for_translate=WordInfo(**word_for_translate.__dict__),
-            other_words=[WordInfo(**word.__dict__) for word in words],
-            in_favorite=True if in_favorite else False
+            word_for_translate=WordInfo.model_validate(word_for_translate),
+            other_words=from_attributes(List[WordInfo], words),
+            in_favorite=True if in_favorite else False,
+            token=create_exercise_token(word_for_translate.id, str(word_for_translate.translation.id))
         )
         return response
 
@@ -130,8 +216,11 @@ class QuizResponseService:
     def create_random_sentence_response(random_sentence_for_translate: SentenceInfo, words_for_sentence: List[str]) -> RandomSentenceResponse:
         response = RandomSentenceResponse(
             type="random_sentence",
-            sentence_for_translate=SentenceInfo(**random_sentence_for_translate.__dict__),
-            words_for_sentence=words_for_sentence
+            sentence_for_translate=SentenceInfo.model_validate(random_sentence_for_translate),
+            words_for_sentence=words_for_sentence,
+            token=create_exercise_token(
+                random_sentence_for_translate.id, random_sentence_for_translate.normalized_name
+            )
         )
         return response
 
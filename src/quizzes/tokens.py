@@ -0,0 +1,48 @@
+import base64
+import hashlib
+import hmac
+import time
+import uuid
+from typing import Optional
+
+from src.config import EXERCISE_TOKEN_SECRET
+
+EXERCISE_TOKEN_TTL = 3600
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> str:
+    return _b64encode(hmac.new(EXERCISE_TOKEN_SECRET.encode(), payload, hashlib.sha256).digest())
+
+
+def answer_digest(subject_id: uuid.UUID, answer: str) -> str:
+    return _sign(f"answer:{subject_id}:{answer}".encode())
+
+
+def create_exercise_token(subject_id: uuid.UUID, answer: str, ttl: int = EXERCISE_TOKEN_TTL) -> str:
+    payload = f"{subject_id}:{answer_digest(subject_id, answer)}:{int(time.time()) + ttl}".encode()
+    return f"{_b64encode(payload)}.{_sign(payload)}"
+
+
+def check_exercise_token(token: Optional[str], subject_id: uuid.UUID, answer: str) -> Optional[bool]:
+    if not token:
+        return None
+    try:
+        encoded_payload, signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        token_subject_id, token_digest, expires_at = payload.decode().split(":")
+        expired = int(expires_at) < time.time()
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    if token_subject_id != str(subject_id) or expired:
+        return None
+    return hmac.compare_digest(token_digest, answer_digest(subject_id, answer))
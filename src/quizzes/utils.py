@@ -1,5 +1,6 @@
 import random
 import string
+from typing import List
 
 from src.models import Word
 
@@ -17,3 +18,15 @@ def shuffle_random_words(other_words: list) -> list:
 def delete_punctuation(text: str) -> str:
     new_text = text.translate(str.maketrans('', '', string.punctuation))
     return new_text
+
+
+def normalize_sentence(text: str) -> str:
+    return delete_punctuation(text).lower()
+
+
+def tokenize_sentence(text: str) -> List[str]:
+    return delete_punctuation(text).split()
+
+
+def normalize_user_words(user_words: List[str]) -> str:
+    return " ".join(user_words).lower()
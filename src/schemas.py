@@ -10,3 +10,4 @@ class WordInfo(BaseModel):
 class SentenceInfo(BaseModel):
     id: UUID4
     name: str
+    model_config = ConfigDict(from_attributes=True)
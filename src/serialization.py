@@ -0,0 +1,26 @@
+import functools
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+loads = orjson.loads
+
+
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def from_attributes(type_: Any, obj: Any) -> Any:
+    return get_type_adapter(type_).validate_python(obj, from_attributes=True)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> str:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import cached, invalidate_tags, request_cache
+from src.users.query import get_user_by_telegram_id
+from src.users.schemas import UserProfile
+
+USER_PROFILE_TTL = 60
+
+
+@cached(key=lambda session, telegram_id: telegram_id, ttl=USER_PROFILE_TTL,
+        tags=lambda session, telegram_id: (f"user:{telegram_id}",), model=Optional[UserProfile])
+async def load_user_profile(session: AsyncSession, telegram_id: int):
+    return await get_user_by_telegram_id(session, telegram_id)
+
+
+async def get_user_profile(session: AsyncSession, telegram_id: int) -> Optional[UserProfile]:
+    cache = request_cache.get()
+    key = ("user", telegram_id)
+    if cache is not None and key in cache:
+        return cache[key]
+    profile = await load_user_profile(session, telegram_id)
+    if cache is not None and profile is not None:
+        cache[key] = profile
+    return profile
+
+
+async def invalidate_user_profile(*telegram_ids: int) -> None:
+    cache = request_cache.get()
+    if cache is not None:
+        for telegram_id in telegram_ids:
+            cache.pop(("user", telegram_id), None)
+    await invalidate_tags(*[f"user:{telegram_id}" for telegram_id in telegram_ids])
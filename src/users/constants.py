@@ -0,0 +1,4 @@
+USER_SEARCH_PAGE_SIZE = 20
+USER_SEARCH_MAX_PAGE_SIZE = 50
+USER_SEARCH_RESULT_CAP = 200
+USER_SEARCH_TRIGRAM_MIN_LENGTH = 3
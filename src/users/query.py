@@ -1,10 +1,13 @@
-from typing import Sequence
+from typing import List, Optional, Sequence
 
 from fastapi import HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import (Integer, Select, String, column, func, or_, select, text, tuple_, update,
+                        values)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
+from src.users.constants import USER_SEARCH_TRIGRAM_MIN_LENGTH
 
 
 async def get_user_by_telegram_id(session: AsyncSession, telegram_id: int) -> User:
@@ -13,26 +16,44 @@ async def get_user_by_telegram_id(session: AsyncSession, telegram_id: int) -> Us
     return user
 
 
-async def get_user_by_username(username: str, session: AsyncSession) -> Sequence[User]:
-    query = select(User).where(User.username.like(f"%{username}%"))
+async def search_users(session: AsyncSession, search: str, limit: int, offset: int):
+    search = search.lower()
+    pattern = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    username, first_name = func.lower(User.username), func.lower(User.first_name)
+    prefix_match = username.like(f"{pattern}%", escape="\\")
+    condition = prefix_match
+    if len(search) >= USER_SEARCH_TRIGRAM_MIN_LENGTH:
+        condition = or_(username.like(f"%{pattern}%", escape="\\"), first_name.like(f"%{pattern}%", escape="\\"))
+    rank = func.greatest(func.similarity(username, search), func.similarity(func.coalesce(first_name, ""), search))
+    query = (select(User.id, User.telegram_id, User.username, User.first_name, User.photo_url)
+             .where(condition)
+             .order_by(prefix_match.desc(), rank.desc(), User.id)
+             .limit(limit)
+             .offset(offset))
     result = await session.execute(query)
-    users = result.scalars().all()
-    return users
+    return result.all()
+
 
+def paginate_users(query: Select, page: Optional[int], size: int, after_id: Optional[int]) -> Select:
+    query = query.limit(size).order_by(User.id)
+    if after_id is not None:
+        return query.where(User.id > after_id)
+    if page is not None:
+        return query.offset((page - 1) * size)
+    return query
 
-async def get_online_users(page: int, size: int, session: AsyncSession, telegram_ids: Sequence[int]):
-    query = (select(User)
-             .where(User.telegram_id.in_(telegram_ids))
-             .limit(size)
-             .offset((page - 1) * size)
-             .order_by(User.id))
+
+async def get_online_users(page: Optional[int], size: int, session: AsyncSession, telegram_ids: Sequence[int],
+                           after_id: Optional[int] = None):
+    query = paginate_users(select(User).where(User.telegram_id.in_(telegram_ids)), page, size, after_id)
     result = await session.execute(query)
     users = result.scalars().all()
     return users
 
 
-async def get_users_list(page: int, size: int, session: AsyncSession) -> Sequence[User]:
-    query = select(User).limit(size).offset((page - 1) * size).order_by(User.id)
+async def get_users_list(page: Optional[int], size: int, session: AsyncSession,
+                         after_id: Optional[int] = None) -> Sequence[User]:
+    query = paginate_users(select(User), page, size, after_id)
     result = await session.execute(query)
     users = result.scalars().all()
     return users
@@ -44,6 +65,14 @@ async def get_users_count(session: AsyncSession) -> int:
     return users_count
 
 
+async def get_users_count_estimate(session: AsyncSession) -> int:
+    query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+    users_count = await session.scalar(query)
+    if users_count is None or users_count < 0:
+        return await get_users_count(session)
+    return users_count
+
+
 async def get_online_users_count(telegram_ids: Sequence[int], session: AsyncSession) -> int:
     query = select(func.count(User.telegram_id)).where(User.telegram_id.in_(telegram_ids))
     users_count = await session.scalar(query)
@@ -53,3 +82,27 @@ async def get_online_users_count(telegram_ids: Sequence[int], session: AsyncSess
 async def get_user_data(session: AsyncSession, telegram_id: int) -> User:
     user_data = await session.scalar(select(User).where(User.telegram_id == telegram_id))
     return user_data
+
+
+async def insert_user_if_not_exists(session: AsyncSession, user_data: dict) -> Optional[User]:
+    query = (insert(User)
+             .values(**user_data)
+             .on_conflict_do_nothing(index_elements=[User.telegram_id])
+             .returning(User))
+    return await session.scalar(query)
+
+
+async def update_users_profiles(session: AsyncSession, profiles: List[dict]) -> Sequence[int]:
+    data = values(column("telegram_id", Integer), column("username", String), column("photo_url", String),
+                  column("first_name", String), name="profiles").data(
+        [(p["telegram_id"], p["username"], p["photo_url"], p["first_name"]) for p in profiles]
+    )
+    query = (update(User)
+             .where(User.telegram_id == data.c.telegram_id)
+             .where(tuple_(User.username, User.photo_url, User.first_name)
+                    .is_distinct_from(tuple_(data.c.username, data.c.photo_url, data.c.first_name)))
+             .values(username=data.c.username, photo_url=data.c.photo_url, first_name=data.c.first_name)
+             .returning(User.telegram_id)
+             .execution_options(synchronize_session=False))
+    result = await session.execute(query)
+    return result.scalars().all()
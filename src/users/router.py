@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,7 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.competitions.dependencies import get_websocket_manager
 from src.competitions.service import WebSocketManager
 from src.database import get_async_session
-from src.users.schemas import UserCreate, UserInfo, UserUpdate, UsersSchema
+from src.users.constants import USER_SEARCH_MAX_PAGE_SIZE, USER_SEARCH_PAGE_SIZE
+from src.users.schemas import (UserCreate, UserInfo, UserSearchResult, UserUpdate, UsersSchema, UsersSyncResponse,
+                               UsersSyncSchema)
 from src.users.service import UserService
 
 router = APIRouter(
@@ -21,31 +23,46 @@ async def create_user(user_data: UserCreate, session: AsyncSession = Depends(get
     return await user.create_user(user_data)
 
 
+@router.post("/sync", response_model=UsersSyncResponse)
+async def sync_users(sync_data: UsersSyncSchema, session: AsyncSession = Depends(get_async_session)):
+    user = UserService(session)
+    return await user.sync_users(sync_data)
+
+
 @router.get("", response_model=UsersSchema)
 async def get_users(
-        page: int = Query(ge=1, default=0),
+        page: Optional[int] = Query(ge=1, default=None),
         size: int = Query(ge=1, le=100),
+        after_id: Optional[int] = Query(ge=0, default=None),
+        with_count: bool = True,
         session: AsyncSession = Depends(get_async_session)
 ):
     user = UserService(session)
-    return await user.get_users(page, size)
+    return await user.get_users(page, size, after_id, with_count)
 
 
 @router.get("/online-users", response_model=UsersSchema)
 async def get_online_users(
-        page: int = Query(ge=1, default=0),
+        page: Optional[int] = Query(ge=1, default=None),
         size: int = Query(ge=1, le=100),
+        after_id: Optional[int] = Query(ge=0, default=None),
+        with_count: bool = True,
         session: AsyncSession = Depends(get_async_session),
         websocket_manager: WebSocketManager = Depends(get_websocket_manager)
 ):
     user = UserService(session)
-    return await user.get_online_users(page, size, websocket_manager)
+    return await user.get_online_users(page, size, websocket_manager, after_id, with_count)
 
 
-@router.get("/find-user")
-async def find_user_by_username(username: str, session: AsyncSession = Depends(get_async_session)):
+@router.get("/find-user", response_model=List[UserSearchResult])
+async def find_user_by_username(
+        username: str = Query(max_length=64),
+        page: int = Query(ge=1, default=1),
+        size: int = Query(ge=1, le=USER_SEARCH_MAX_PAGE_SIZE, default=USER_SEARCH_PAGE_SIZE),
+        session: AsyncSession = Depends(get_async_session)
+):
     user = UserService(session)
-    return await user.find_user_by_username(username)
+    return await user.find_user_by_username(username, page, size)
 
 
 @router.get("/{telegram_id}", response_model=UserInfo)
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import List, Optional
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from src.constants import AvailableLanguages
 
@@ -21,6 +22,8 @@ class UserCreate(BaseModel):
 
 
 class UserInfo(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     telegram_id: int
     photo_url: str
@@ -45,5 +48,44 @@ class UserUpdate(BaseModel):
 
 
 class UsersSchema(BaseModel):
-    users_count: int
+    users_count: Optional[int] = None
+    next_after_id: Optional[int] = None
     users: list[UserInfo]
+
+
+class UserSearchResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    telegram_id: int
+    username: str
+    first_name: Optional[str] = None
+    photo_url: str
+
+
+class UserProfile(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    telegram_id: int
+    username: str
+    first_name: Optional[str] = None
+    photo_url: str
+    rating: str
+    learning_language_from_id: int
+    learning_language_to_id: int
+
+
+class UserProfileSync(BaseModel):
+    telegram_id: int
+    username: str
+    photo_url: str
+    first_name: Optional[str] = None
+
+
+class UsersSyncSchema(BaseModel):
+    users: List[UserProfileSync] = Field(max_length=1000)
+
+
+class UsersSyncResponse(BaseModel):
+    updated: int
@@ -1,12 +1,20 @@
+from typing import List, Optional, Sequence
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import cached
 from src.competitions.service import WebSocketManager
 from src.constants import levels
 from src.models import User
+from src.quizzes.dependencies import exercise_queue
+from src.users.cache import invalidate_user_profile
+from src.users.constants import USER_SEARCH_RESULT_CAP
 from src.users.query import get_user_by_telegram_id, get_user_data, get_users_list, get_online_users, \
-    get_user_by_username, get_users_count, get_online_users_count
-from src.users.schemas import UserCreate, UserInfo, UserUpdate, UsersSchema
+    search_users, get_users_count_estimate, insert_user_if_not_exists, update_users_profiles
+from src.users.schemas import UserCreate, UserInfo, UserSearchResult, UserUpdate, UsersSchema, UsersSyncResponse, \
+    UsersSyncSchema
+from src.serialization import from_attributes
 from src.utils import commit_changes_or_rollback
 
 
@@ -16,14 +24,12 @@ class UserService:
 
     async def create_user(self, user_data: UserCreate):
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, user_data.telegram_id)
-            if user:
+            new_user = await insert_user_if_not_exists(session, self.prepare_data_for_create_user(user_data))
+            if new_user is None:
                 raise HTTPException(status_code=203, detail="Пользователь уже зарегистрирован")
-            new_user_data = self.prepare_data_for_create_user(user_data)
-            new_user = User(**new_user_data)
-            session.add(new_user)
             await commit_changes_or_rollback(session, "Ошибка при сохранении пользователя")
-            return UserInfo(**new_user.__dict__)
+            await invalidate_user_profile(new_user.telegram_id)
+            return UserInfo.model_validate(new_user)
 
     def prepare_data_for_create_user(self, user_data: UserCreate):
         user_data = user_data.dict()
@@ -37,32 +43,59 @@ class UserService:
             user.learning_language_to_id = user_data.learning_language_to_id.value
             user.learning_language_from_id = user_data.learning_language_from_id.value
             await commit_changes_or_rollback(session, message="Ошибка при обновлении данных")
+            await invalidate_user_profile(user_data.telegram_id)
+            await exercise_queue.clear(user_data.telegram_id)
             return {"message": "Данные успешно обновлены"}
 
-    async def get_users(self, page: int, size: int):
+    async def sync_users(self, sync_data: UsersSyncSchema) -> UsersSyncResponse:
+        profiles = {user.telegram_id: user.model_dump() for user in sync_data.users}
+        if not profiles:
+            return UsersSyncResponse(updated=0)
+        async with self.session as session:
+            updated_telegram_ids = await update_users_profiles(session, list(profiles.values()))
+            await commit_changes_or_rollback(session, "Ошибка при обновлении пользователей")
+            if updated_telegram_ids:
+                await invalidate_user_profile(*updated_telegram_ids)
+            return UsersSyncResponse(updated=len(updated_telegram_ids))
+
+    async def get_users(self, page: Optional[int], size: int, after_id: Optional[int] = None,
+                        with_count: bool = True) -> UsersSchema:
         async with self.session as session:
-            users = await get_users_list(page, size, session)
-            users_count = await get_users_count(session)
-            return UsersSchema(users_count=users_count, users=[UserInfo(**user.__dict__) for user in users])
+            users = await get_users_list(page, size, session, after_id)
+            users_count = await get_users_count_estimate(session) if with_count else None
+            return self.create_users_response(users, size, users_count)
 
-    async def get_online_users(self, page: int, size: int, websocket_manager: WebSocketManager):
+    async def get_online_users(self, page: Optional[int], size: int, websocket_manager: WebSocketManager,
+                               after_id: Optional[int] = None, with_count: bool = True) -> UsersSchema:
         async with self.session as session:
-            telegram_ids = websocket_manager.websockets.keys()
-            users = await get_online_users(page, size, session, telegram_ids)
-            users_count = await get_online_users_count(telegram_ids, session)
-            return UsersSchema(users_count=users_count, users=[UserInfo(**user.__dict__) for user in users])
+            telegram_ids = list(websocket_manager.websockets.keys())
+            users = await get_online_users(page, size, session, telegram_ids, after_id)
+            users_count = len(telegram_ids) if with_count else None
+            return self.create_users_response(users, size, users_count)
+
+    @staticmethod
+    def create_users_response(users: Sequence[User], size: int, users_count: Optional[int]) -> UsersSchema:
+        next_after_id = users[-1].id if len(users) == size else None
+        return UsersSchema(users_count=users_count, next_after_id=next_after_id,
+                           users=from_attributes(List[UserInfo], users))
 
+    @cached(key=lambda self, telegram_id: telegram_id, ttl=300,
+            tags=lambda self, telegram_id: (f"user:{telegram_id}",), model=UserInfo)
     async def get_user_info(self, telegram_id: int) -> UserInfo:
         async with self.session as session:
             user_data = await get_user_data(session, telegram_id)
             if user_data is None:
                 raise HTTPException(status_code=404, detail="Пользователь не найден")
-            return UserInfo(**user_data.__dict__)
+            return UserInfo.model_validate(user_data)
 
-    async def find_user_by_username(self, username: str):
+    async def find_user_by_username(self, username: str, page: int, size: int) -> List[UserSearchResult]:
+        username = username.strip()
+        offset = (page - 1) * size
+        if not username or offset >= USER_SEARCH_RESULT_CAP:
+            return []
         async with self.session as session:
-            user = await get_user_by_username(username, session)
-            return user
+            users = await search_users(session, username, min(size, USER_SEARCH_RESULT_CAP - offset), offset)
+            return from_attributes(List[UserSearchResult], users)
 
 
     @staticmethod
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+from typing import AsyncIterator
+
+from src.constants import AvailableLanguages
+from src.database import async_session_maker
+from src.words.constants import FileFormat
+from src.words.importer import (IMPORT_BATCH_SIZE, IMPORT_MAX_BATCH_SIZE, SentenceImporter,
+                                WordImporter, iter_lines, iter_rows,
+                                iter_sentence_pairs)
+from src.words.schemas import ImportReport
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := await asyncio.to_thread(file.read, READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def print_progress(report: ImportReport) -> None:
+    print(f"обработано: {report.processed}, добавлено: {report.imported}, "
+          f"дубликатов: {report.duplicates}, с ошибками: {report.invalid}", flush=True)
+
+
+async def import_words(path: str, file_format: FileFormat, batch_size: int) -> None:
+    async with async_session_maker() as session:
+        word_importer = WordImporter(session, batch_size)
+        report = await word_importer.import_rows(iter_rows(iter_lines(read_file(path)), file_format), print_progress)
+    for error in report.errors:
+        print(error)
+
+
+async def import_sentences(path: str, translation_from_language: AvailableLanguages,
+                           translation_to_language: AvailableLanguages, batch_size: int) -> None:
+    async with async_session_maker() as session:
+        sentence_importer = SentenceImporter(session, batch_size)
+        rows = iter_sentence_pairs(iter_lines(read_file(path)), translation_from_language, translation_to_language)
+        report = await sentence_importer.import_rows(rows, print_progress)
+    for error in report.errors:
+        print(error)
+
+
+def language(value: str) -> AvailableLanguages:
+    return AvailableLanguages(int(value)) if value.isdigit() else AvailableLanguages[value]
+
+
+def import_batch_size(value: str) -> int:
+    size = int(value)
+    if not 1 <= size <= IMPORT_MAX_BATCH_SIZE:
+        raise argparse.ArgumentTypeError(f"размер пачки должен быть от 1 до {IMPORT_MAX_BATCH_SIZE}")
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.words.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    words_parser = subparsers.add_parser("import-words", help="Импорт слов из CSV или NDJSON")
+    words_parser.add_argument("path")
+    words_parser.add_argument("--format", type=FileFormat, default=FileFormat.csv, dest="file_format")
+    words_parser.add_argument("--batch-size", type=import_batch_size, default=IMPORT_BATCH_SIZE)
+
+    sentences_parser = subparsers.add_parser("import-sentences",
+                                             help="Импорт предложений из TSV: предложение, перевод, уровень")
+    sentences_parser.add_argument("path")
+    sentences_parser.add_argument("--from", type=language, required=True, dest="translation_from_language")
+    sentences_parser.add_argument("--to", type=language, required=True, dest="translation_to_language")
+    sentences_parser.add_argument("--batch-size", type=import_batch_size, default=IMPORT_BATCH_SIZE)
+
+    args = parser.parse_args()
+    if args.command == "import-words":
+        asyncio.run(import_words(args.path, args.file_format, args.batch_size))
+    elif args.command == "import-sentences":
+        asyncio.run(import_sentences(args.path, args.translation_from_language, args.translation_to_language,
+                                     args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
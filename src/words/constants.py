@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class FileFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class ExportEntity(str, Enum):
+    words = "words"
+    sentences = "sentences"
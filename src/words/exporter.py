@@ -0,0 +1,29 @@
+import csv
+import io
+from typing import AsyncIterator
+
+from sqlalchemy import Select
+
+from src.database import async_session_maker
+from src.serialization import dumps
+from src.words.constants import FileFormat
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def format_rows(rows: list, columns: list, file_format: FileFormat) -> str:
+    if file_format == FileFormat.ndjson:
+        return "".join(dumps(dict(zip(columns, row))) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def export_rows(query: Select, file_format: FileFormat) -> AsyncIterator[str]:
+    columns = [column.name for column in query.selected_columns]
+    if file_format == FileFormat.csv:
+        yield format_rows([columns], columns, file_format)
+    async with async_session_maker() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.partitions():
+            yield format_rows(rows, columns, file_format)
@@ -0,0 +1,100 @@
+import random
+import uuid
+from typing import List, Optional
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_redis
+from src.quizzes.query import get_user_favorite_word_ids
+
+FAVORITE_WORDS_TTL = 86400
+FAVORITE_WORDS_MARKER = "-"
+
+UPDATE_IF_EXISTS_SCRIPT = """
+redis.call('incr', KEYS[2])
+redis.call('expire', KEYS[2], ARGV[3])
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call(ARGV[1], KEYS[1], ARGV[2])
+end
+return -1
+"""
+
+REPLACE_IF_VERSION_SCRIPT = """
+if (redis.call('get', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('del', KEYS[1])
+for i = 3, #ARGV, 1000 do
+    redis.call('sadd', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('expire', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class FavoriteWordsStore:
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._update_if_exists = redis_client.register_script(UPDATE_IF_EXISTS_SCRIPT)
+        self._replace_if_version = redis_client.register_script(REPLACE_IF_VERSION_SCRIPT)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"favorite_words:{user_id}"
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"favorite_words:{user_id}:version"
+
+    async def _load(self, session: AsyncSession, user_id: int) -> set:
+        version = await self.redis.get(self._version_key(user_id))
+        word_ids = {str(word_id) for word_id in await get_user_favorite_word_ids(session, user_id)}
+        await self._replace_if_version(keys=[self._key(user_id), self._version_key(user_id)],
+                                       args=[version or "0", FAVORITE_WORDS_TTL, FAVORITE_WORDS_MARKER, *word_ids])
+        return word_ids
+
+    async def contains(self, session: AsyncSession, user_id: int, word_id: uuid.UUID) -> bool:
+        return (await self.contains_many(session, user_id, [word_id]))[0]
+
+    async def contains_many(self, session: AsyncSession, user_id: int, word_ids: List[uuid.UUID]) -> List[bool]:
+        if not word_ids:
+            return []
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            exists, flags = await pipe.exists(key).smismember(key, [str(word_id) for word_id in word_ids]).execute()
+        if exists:
+            return [bool(flag) for flag in flags]
+        favorite_word_ids = await self._load(session, user_id)
+        return [str(word_id) in favorite_word_ids for word_id in word_ids]
+
+    async def random_word_id(self, session: AsyncSession, user_id: int) -> Optional[uuid.UUID]:
+        key = self._key(user_id)
+        members = await self.redis.srandmember(key, 2)
+        if not members:
+            favorite_word_ids = await self._load(session, user_id)
+            members = [random.choice(list(favorite_word_ids))] if favorite_word_ids else []
+        for member in members:
+            member = member.decode() if isinstance(member, bytes) else member
+            if member != FAVORITE_WORDS_MARKER:
+                return uuid.UUID(member)
+        return None
+
+    async def count(self, session: AsyncSession, user_id: int) -> int:
+        key = self._key(user_id)
+        count = await self.redis.scard(key)
+        if not count:
+            return len(await self._load(session, user_id))
+        return count - 1
+
+    async def add(self, user_id: int, word_id: uuid.UUID) -> None:
+        await self._update_if_exists(keys=[self._key(user_id), self._version_key(user_id)],
+                                     args=["sadd", str(word_id), FAVORITE_WORDS_TTL])
+
+    async def remove(self, user_id: int, word_id: uuid.UUID) -> None:
+        await self._update_if_exists(keys=[self._key(user_id), self._version_key(user_id)],
+                                     args=["srem", str(word_id), FAVORITE_WORDS_TTL])
+
+
+favorite_words_store = FavoriteWordsStore(get_redis())
@@ -0,0 +1,249 @@
+import csv
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import invalidate_tags
+from src.constants import AvailableLanguages
+from src.quizzes.pool import (PoolSentence, PoolTranslation, PoolWord,
+                              sentence_pool, word_pool)
+from src.quizzes.utils import normalize_sentence, tokenize_sentence
+from src.serialization import loads
+from src.utils import commit_changes_or_rollback
+from src.words.constants import FileFormat
+from src.words.query import (get_existing_sentences, get_existing_words, insert_sentences,
+                             insert_translation_sentences, insert_translation_words, insert_words)
+from src.words.schemas import ImportReport, SentenceSchema, WordSchema
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_BATCH_SIZE = 32767 // 7
+IMPORT_MAX_ERRORS = 100
+LANGUAGE_FIELDS = ("translation_from_language", "translation_to_language")
+
+
+def decode_line(line: bytes) -> Optional[str]:
+    try:
+        return line.decode("utf-8-sig").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Optional[str]]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield decode_line(line)
+    if buffer:
+        yield decode_line(buffer)
+
+
+async def iter_csv_records(lines: AsyncIterable[Optional[str]], delimiter: str) -> AsyncIterator[Optional[list]]:
+    record, quotes = [], 0
+    async for line in lines:
+        if line is None:
+            record, quotes = [], 0
+            yield None
+            continue
+        if not record and not line.strip():
+            continue
+        record.append(f"{line}\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        yield next(csv.reader(record, delimiter=delimiter))
+        record, quotes = [], 0
+    if record:
+        yield None
+
+
+async def iter_rows(lines: AsyncIterable[Optional[str]], file_format: FileFormat,
+                    delimiter: str = ",") -> AsyncIterator[Optional[dict]]:
+    if file_format == FileFormat.ndjson:
+        async for line in lines:
+            if line is None:
+                yield None
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                yield None
+        return
+    header = None
+    async for values in iter_csv_records(lines, delimiter):
+        if values is None:
+            yield None
+        elif header is None:
+            header = values
+        else:
+            yield dict(zip(header, values))
+
+
+async def iter_sentence_pairs(lines: AsyncIterable[Optional[str]], translation_from_language: AvailableLanguages,
+                              translation_to_language: AvailableLanguages) -> AsyncIterator[Optional[dict]]:
+    async for line in lines:
+        if line is None:
+            yield None
+            continue
+        if not line.strip():
+            continue
+        values = line.split("\t")
+        if len(values) != 3:
+            yield None
+            continue
+        sentence_to_translate, translation_sentence, level = (value.strip() for value in values)
+        yield {
+            "sentence_to_translate": sentence_to_translate,
+            "translation_sentence": translation_sentence,
+            "level": level.upper(),
+            "translation_from_language": translation_from_language,
+            "translation_to_language": translation_to_language,
+        }
+
+
+def coerce_languages(row: dict) -> dict:
+    for field in LANGUAGE_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str) and value.isdigit():
+            row[field] = int(value)
+    return row
+
+
+class BaseImporter(ABC):
+    schema = BaseModel
+
+    def __init__(self, session: AsyncSession, batch_size: int = IMPORT_BATCH_SIZE):
+        self.session = session
+        self.batch_size = batch_size
+        self.report = ImportReport()
+
+    async def import_rows(
+            self, rows: AsyncIterable[dict],
+            on_progress: Optional[Callable[[ImportReport], Awaitable[None]]] = None
+    ) -> ImportReport:
+        batch = []
+        async for row in rows:
+            self.report.processed += 1
+            item = self.validate(row)
+            if item is None:
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                await self.flush(batch)
+                batch = []
+                if on_progress:
+                    await on_progress(self.report)
+        if batch:
+            await self.flush(batch)
+            if on_progress:
+                await on_progress(self.report)
+        return self.report
+
+    def validate(self, row: Optional[dict]) -> Optional[BaseModel]:
+        if not isinstance(row, dict):
+            self.add_error("некорректный формат строки")
+            return None
+        try:
+            return self.schema(**coerce_languages(row))
+        except ValidationError as e:
+            self.add_error("; ".join(error["msg"] for error in e.errors()))
+        except KeyError as e:
+            self.add_error(f"отсутствует поле {e}")
+        return None
+
+    def add_error(self, message: str) -> None:
+        self.report.invalid += 1
+        if len(self.report.errors) < IMPORT_MAX_ERRORS:
+            self.report.errors.append(f"Строка {self.report.processed}: {message}")
+
+    @abstractmethod
+    async def flush(self, batch: List[BaseModel]) -> None:
+        pass
+
+
+class WordImporter(BaseImporter):
+    schema = WordSchema
+
+    async def flush(self, batch: List[WordSchema]) -> None:
+        unique_words: Dict[Tuple[str, int], WordSchema] = {}
+        for word_data in batch:
+            unique_words.setdefault((word_data.word_to_translate, word_data.translation_from_language.value), word_data)
+        async with self.session as session:
+            for key in await get_existing_words(session, unique_words):
+                unique_words.pop(key, None)
+            self.report.duplicates += len(batch) - len(unique_words)
+            if not unique_words:
+                return
+
+            words = await insert_words(session, [{"name": word_data.word_to_translate,
+                                                  "language_id": word_data.translation_from_language.value,
+                                                  "part_of_speech": word_data.part_of_speech.name,
+                                                  "level": word_data.level.value}
+                                                 for word_data in unique_words.values()])
+            new_words = {(word.name, word.language_id): word for word in words}
+            translations = await insert_translation_words(session, [
+                {"name": unique_words[key].translation_word,
+                 "word_id": word.id,
+                 "from_language_id": unique_words[key].translation_from_language.value,
+                 "to_language_id": unique_words[key].translation_to_language.value}
+                for key, word in new_words.items()
+            ])
+            translations_by_word = {translation.word_id: translation for translation in translations}
+            await commit_changes_or_rollback(session, "Ошибка при импорте слов")
+        await invalidate_tags("words")
+
+        for word in new_words.values():
+            translation = translations_by_word[word.id]
+            word_pool.add(PoolWord(word.id, word.name, word.language_id, word.part_of_speech, word.level,
+                                   PoolTranslation(translation.id, translation.name, word.id,
+                                                   translation.to_language_id)))
+        self.report.imported += len(new_words)
+
+
+class SentenceImporter(BaseImporter):
+    schema = SentenceSchema
+
+    async def flush(self, batch: List[SentenceSchema]) -> None:
+        unique_sentences: Dict[Tuple[str, int], SentenceSchema] = {}
+        for sentence_data in batch:
+            unique_sentences.setdefault(
+                (sentence_data.sentence_to_translate, sentence_data.translation_from_language.value), sentence_data
+            )
+        async with self.session as session:
+            for key in await get_existing_sentences(session, unique_sentences):
+                unique_sentences.pop(key, None)
+            self.report.duplicates += len(batch) - len(unique_sentences)
+            if not unique_sentences:
+                return
+
+            new_sentences = []
+            for sentence_data in unique_sentences.values():
+                sentence_id, translation_sentence = uuid.uuid4(), sentence_data.translation_sentence
+                new_sentences.append(PoolSentence(
+                    sentence_id, sentence_data.sentence_to_translate, sentence_data.translation_from_language.value,
+                    sentence_data.level.value,
+                    PoolTranslation(uuid.uuid4(), translation_sentence, sentence_id,
+                                    sentence_data.translation_to_language.value),
+                    tuple(tokenize_sentence(translation_sentence)), normalize_sentence(translation_sentence)
+                ))
+            await insert_sentences(session, [
+                {"id": sentence.id, "name": sentence.name, "language_id": sentence.language_id,
+                 "level": sentence.level} for sentence in new_sentences
+            ])
+            await insert_translation_sentences(session, [
+                {"id": sentence.translation.id, "name": sentence.translation.name, "sentence_id": sentence.id,
+                 "from_language_id": sentence.language_id, "to_language_id": sentence.translation.to_language_id,
+                 "normalized_name": sentence.normalized_name, "tokens": list(sentence.tokens)}
+                for sentence in new_sentences
+            ])
+            await commit_changes_or_rollback(session, "Ошибка при импорте предложений")
+
+        for sentence in new_sentences:
+            sentence_pool.add(sentence)
+        self.report.imported += len(new_sentences)
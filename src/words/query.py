@@ -1,7 +1,13 @@
-from sqlalchemy import select, distinct
+import uuid
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Select, distinct, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Language, Word
+from src.constants import AvailableLanguages
+from src.models import FavoriteWord, Language, Sentence, TranslationSentence, TranslationWord, Word
+from src.quizzes.constants import AvailablePartOfSpeech, AvailableWordLevel
 
 
 async def get_available_languages(session: AsyncSession):
@@ -14,3 +20,118 @@ async def get_available_part_of_speech(session: AsyncSession):
     query = await session.execute(select(distinct(Word.part_of_speech)))
     available_part_of_speech = query.scalars().all()
     return [w for w in available_part_of_speech]
+
+
+async def insert_favorite_word_if_not_exists(session: AsyncSession, user_id: int,
+                                             word_id: uuid.UUID) -> Optional[int]:
+    query = (insert(FavoriteWord)
+             .values(user_id=user_id, word_id=word_id)
+             .on_conflict_do_nothing(index_elements=[FavoriteWord.user_id, FavoriteWord.word_id])
+             .returning(FavoriteWord.id))
+    return await session.scalar(query)
+
+
+async def get_user_favorite_words(
+        session: AsyncSession, user_id: int, after_id: Optional[int], limit: int,
+        level: Optional[AvailableWordLevel], part_of_speech: Optional[AvailablePartOfSpeech]
+):
+    query = (select(FavoriteWord.id, FavoriteWord.word_id, Word.name, TranslationWord.id.label("translation_id"),
+                    TranslationWord.name.label("translation"), Word.part_of_speech, Word.level)
+             .join(Word, Word.id == FavoriteWord.word_id)
+             .join(TranslationWord, TranslationWord.word_id == Word.id)
+             .where(FavoriteWord.user_id == user_id)
+             .order_by(FavoriteWord.id)
+             .limit(limit))
+    if after_id is not None:
+        query = query.where(FavoriteWord.id > after_id)
+    if level:
+        query = query.where(Word.level == level.value)
+    if part_of_speech:
+        query = query.where(Word.part_of_speech == part_of_speech.name)
+    result = await session.execute(query)
+    return result.all()
+
+
+def get_words_export_query(
+        translation_from_language: Optional[AvailableLanguages],
+        translation_to_language: Optional[AvailableLanguages],
+        level: Optional[AvailableWordLevel],
+        part_of_speech: Optional[AvailablePartOfSpeech]
+) -> Select:
+    query = (select(Word.id.label("word_id"),
+                    Word.name.label("word_to_translate"),
+                    TranslationWord.name.label("translation_word"),
+                    Word.language_id.label("translation_from_language"),
+                    TranslationWord.to_language_id.label("translation_to_language"),
+                    Word.part_of_speech,
+                    Word.level)
+             .join(TranslationWord, TranslationWord.word_id == Word.id))
+    if translation_from_language:
+        query = query.where(Word.language_id == translation_from_language.value)
+    if translation_to_language:
+        query = query.where(TranslationWord.to_language_id == translation_to_language.value)
+    if level:
+        query = query.where(Word.level == level.value)
+    if part_of_speech:
+        query = query.where(Word.part_of_speech == part_of_speech.name)
+    return query
+
+
+def get_sentences_export_query(
+        translation_from_language: Optional[AvailableLanguages],
+        translation_to_language: Optional[AvailableLanguages],
+        level: Optional[AvailableWordLevel]
+) -> Select:
+    query = (select(Sentence.id.label("sentence_id"),
+                    Sentence.name.label("sentence_to_translate"),
+                    TranslationSentence.name.label("translation_sentence"),
+                    Sentence.language_id.label("translation_from_language"),
+                    TranslationSentence.to_language_id.label("translation_to_language"),
+                    Sentence.level)
+             .join(TranslationSentence, TranslationSentence.sentence_id == Sentence.id))
+    if translation_from_language:
+        query = query.where(Sentence.language_id == translation_from_language.value)
+    if translation_to_language:
+        query = query.where(TranslationSentence.to_language_id == translation_to_language.value)
+    if level:
+        query = query.where(Sentence.level == level.value)
+    return query
+
+
+async def get_existing_words(session: AsyncSession, keys: Iterable[Tuple[str, int]]) -> Set[Tuple[str, int]]:
+    result = await session.execute(
+        select(Word.name, Word.language_id).where(tuple_(Word.name, Word.language_id).in_(list(keys)))
+    )
+    return {tuple(key) for key in result.all()}
+
+
+async def insert_words(session: AsyncSession, words: List[dict]):
+    result = await session.execute(
+        insert(Word).values(words).returning(Word.id, Word.name, Word.language_id, Word.part_of_speech, Word.level)
+    )
+    return result.all()
+
+
+async def insert_translation_words(session: AsyncSession, translations: List[dict]):
+    result = await session.execute(
+        insert(TranslationWord)
+        .values(translations)
+        .returning(TranslationWord.id, TranslationWord.name, TranslationWord.word_id, TranslationWord.to_language_id)
+    )
+    return result.all()
+
+
+async def get_existing_sentences(session: AsyncSession, keys: Iterable[Tuple[str, int]]) -> Set[Tuple[str, int]]:
+    result = await session.execute(
+        select(Sentence.name, Sentence.language_id)
+        .where(tuple_(Sentence.name, Sentence.language_id).in_(list(keys)))
+    )
+    return {tuple(key) for key in result.all()}
+
+
+async def insert_sentences(session: AsyncSession, sentences: List[dict]) -> None:
+    await session.execute(insert(Sentence).values(sentences))
+
+
+async def insert_translation_sentences(session: AsyncSession, translations: List[dict]) -> None:
+    await session.execute(insert(TranslationSentence).values(translations))
@@ -1,17 +1,26 @@
+from typing import Optional
+
 import redis
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.competitions.dependencies import get_cache_service
 from src.constants import AvailableLanguages
 from src.database import get_async_session, get_redis
 from src.quizzes.constants import AvailablePartOfSpeech, AvailableWordLevel
 from src.quizzes.schemas import UserFavoriteWord
-from src.words.query import get_available_languages, get_available_part_of_speech
-from src.words.schemas import WordSchema, SentenceSchema
+from src.words.constants import ExportEntity, FileFormat
+from src.words.exporter import export_rows
+from src.words.importer import (SentenceImporter, WordImporter, iter_lines,
+                                iter_rows, iter_sentence_pairs)
+from src.words.query import (get_available_languages,
+                             get_available_part_of_speech,
+                             get_sentences_export_query,
+                             get_words_export_query)
+from src.words.schemas import FavoriteWordsPage, ImportReport, WordSchema, SentenceSchema
 from src.words.service import (FavoriteWordManager,
                                SentenceManager,
-                               WordManager, CacheRedisService)
+                               WordManager)
 
 router = APIRouter(
     prefix="/words",
@@ -26,6 +35,40 @@ async def add_word(word_data: WordSchema, session: AsyncSession = Depends(get_as
     return await word_service.add_word(word_data)
 
 
+@router.post("/import-words", response_model=ImportReport)
+async def import_words(request: Request, file_format: FileFormat = FileFormat.csv,
+                       session: AsyncSession = Depends(get_async_session)):
+    word_importer = WordImporter(session)
+    return await word_importer.import_rows(iter_rows(iter_lines(request.stream()), file_format))
+
+
+@router.post("/import-sentences", response_model=ImportReport)
+async def import_sentences(request: Request, translation_from_language: AvailableLanguages,
+                           translation_to_language: AvailableLanguages,
+                           session: AsyncSession = Depends(get_async_session)):
+    sentence_importer = SentenceImporter(session)
+    return await sentence_importer.import_rows(
+        iter_sentence_pairs(iter_lines(request.stream()), translation_from_language, translation_to_language)
+    )
+
+
+@router.get("/export")
+async def export_dictionary(
+        entity: ExportEntity = ExportEntity.words,
+        file_format: FileFormat = FileFormat.ndjson,
+        translation_from_language: Optional[AvailableLanguages] = None,
+        translation_to_language: Optional[AvailableLanguages] = None,
+        level: Optional[AvailableWordLevel] = None,
+        part_of_speech: Optional[AvailablePartOfSpeech] = None
+):
+    if entity == ExportEntity.words:
+        query = get_words_export_query(translation_from_language, translation_to_language, level, part_of_speech)
+    else:
+        query = get_sentences_export_query(translation_from_language, translation_to_language, level)
+    media_type = "text/csv" if file_format == FileFormat.csv else "application/x-ndjson"
+    return StreamingResponse(export_rows(query, file_format), media_type=media_type)
+
+
 @router.post("/add-sentence")
 async def add_sentence(sentence_data: SentenceSchema, session: AsyncSession = Depends(get_async_session)
 ):
@@ -39,6 +82,19 @@ async def add_favorite_word(data: UserFavoriteWord, session: AsyncSession = Depe
     return await favorite_word_service.add_favorite_word(data)
 
 
+@router.get("/favorite-words", response_model=FavoriteWordsPage)
+async def get_favorite_words(
+        telegram_id: int,
+        after_id: Optional[int] = Query(ge=0, default=None),
+        size: int = Query(ge=1, le=100, default=20),
+        level: Optional[AvailableWordLevel] = None,
+        part_of_speech: Optional[AvailablePartOfSpeech] = None,
+        session: AsyncSession = Depends(get_async_session)
+):
+    favorite_word_service = FavoriteWordManager(session)
+    return await favorite_word_service.get_favorite_words(telegram_id, after_id, size, level, part_of_speech)
+
+
 @router.delete("/favorite-word")
 async def delete_favorite_word(data: UserFavoriteWord, session: AsyncSession = Depends(get_async_session)):
     favorite_word_service = FavoriteWordManager(session)
@@ -46,19 +102,13 @@ async def delete_favorite_word(data: UserFavoriteWord, session: AsyncSession = D
 
 
 @router.get("/check-available-language")
-async def check_available_language(
-        session: AsyncSession = Depends(get_async_session),
-        cache_service: CacheRedisService = Depends(get_cache_service)
-):
+async def check_available_language(session: AsyncSession = Depends(get_async_session)):
     word_manager = WordManager(session)
-    available_languages = await word_manager.get_languages(cache_service)
+    available_languages = await word_manager.get_languages()
     return available_languages
 
 
 @router.get("/check-available-part-of-speech")
-async def check_available_part_of_speech(
-        session: AsyncSession = Depends(get_async_session),
-        cache_service: CacheRedisService = Depends(get_cache_service)
-):
+async def check_available_part_of_speech(session: AsyncSession = Depends(get_async_session)):
     word_manager = WordManager(session)
-    return await word_manager.get_parts_of_speech(cache_service)
+    return await word_manager.get_parts_of_speech()
@@ -1,6 +1,7 @@
 import uuid
+from typing import List, Optional
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ConfigDict, model_validator
 from src.constants import AvailableLanguages
 from src.quizzes.constants import AvailablePartOfSpeech, AvailableWordLevel
 
@@ -38,3 +39,29 @@ class SentenceSchema(BaseTranslationSchema):
         if values['sentence_to_translate'] == values['translation_sentence']:
             raise ValueError("Предложения должны отличаться друг от друга")
         return values
+
+
+class ImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: List[str] = []
+
+
+class FavoriteWordInfo(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    word_id: uuid.UUID
+    name: str
+    translation_id: uuid.UUID
+    translation: str
+    part_of_speech: str
+    level: str
+
+
+class FavoriteWordsPage(BaseModel):
+    total: int
+    next_after_id: Optional[int] = None
+    words: List[FavoriteWordInfo]
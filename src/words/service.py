@@ -1,33 +1,24 @@
-import json
+from typing import List, Optional
 
-import redis
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import (FavoriteWord, Sentence, TranslationSentence,
-                        TranslationWord, Word)
-from src.quizzes.query import get_user_favorite_word, get_user_favorite_words
+from src.cache import cached, invalidate_tags
+from src.models import Sentence, TranslationSentence, TranslationWord, Word
+from src.quizzes.dependencies import exercise_queue
+from src.quizzes.constants import AvailablePartOfSpeech, AvailableWordLevel
+from src.quizzes.pool import (PoolSentence, PoolTranslation, PoolWord,
+                              sentence_pool, word_pool)
+from src.quizzes.query import get_user_favorite_word
 from src.quizzes.schemas import UserFavoriteWord
-from src.users.query import get_user_by_telegram_id
+from src.quizzes.utils import normalize_sentence, tokenize_sentence
+from src.users.cache import get_user_profile
+from src.serialization import from_attributes
 from src.utils import commit_changes_or_rollback
-from src.words.query import get_available_part_of_speech, get_available_languages
-from src.words.schemas import WordSchema, SentenceSchema
-
-
-class CacheRedisService:
-
-    def __init__(self, redis_client: redis.Redis):
-        self.redis = redis_client
-
-    async def get_cached_value(self, key: str):
-        value = await self.redis.get(key)
-        if value:
-            await self.redis.delete(key)
-            return json.loads(value)
-        return None
-
-    async def set_cached_value(self, key: str, data, expire: int = 3600):
-        await self.redis.set(key, json.dumps(data), ex=expire)
+from src.words.favorites import favorite_words_store
+from src.words.query import (get_available_part_of_speech, get_available_languages, get_user_favorite_words,
+                             insert_favorite_word_if_not_exists)
+from src.words.schemas import FavoriteWordInfo, FavoriteWordsPage, WordSchema, SentenceSchema
 
 
 class BaseManager:
@@ -57,50 +48,46 @@ class WordManager(BaseManager):
             )
             session.add(new_translation_word)
             await commit_changes_or_rollback(session, "Ошибка при добавлении слова")
+            await invalidate_tags("words")
+            word_pool.add(PoolWord(
+                new_word.id, new_word.name, new_word.language_id, new_word.part_of_speech, new_word.level,
+                PoolTranslation(new_translation_word.id, new_translation_word.name, new_word.id,
+                                new_translation_word.to_language_id)
+            ))
             return {"message": "Слово успешно добавлено"}
 
-    async def get_parts_of_speech(self, cache_service: CacheRedisService):
-        parts_of_speech = await cache_service.get_cached_value("parts_of_speech")
-        if parts_of_speech:
-            return parts_of_speech
+    @cached(key=lambda self: "all", tags=("words",))
+    async def get_parts_of_speech(self):
         async with self.session as session:
-            parts_of_speech = await get_available_part_of_speech(session)
-            await cache_service.set_cached_value(
-                "parts_of_speech", [part for part in parts_of_speech], 3600
-            )
-            return parts_of_speech
+            return await get_available_part_of_speech(session)
 
-    async def get_languages(self, cache_service: CacheRedisService):
-        languages = await cache_service.get_cached_value("languages")
-        if languages:
-            return languages
+    # языки добавляются только миграциями, поэтому кэш не сбрасывается
+    @cached(key=lambda self: "all")
+    async def get_languages(self):
         async with self.session as session:
             languages = await get_available_languages(session)
-            languages_data = [{"language": language.language, "id": language.id} for language in languages]
-            await cache_service.set_cached_value("languages", languages_data, 3600)
-            return languages
+            return [{"language": language.language, "id": language.id} for language in languages]
 
 
 class FavoriteWordManager(BaseManager):
 
     async def add_favorite_word(self, data: UserFavoriteWord):
         async with self.session as session:
-            user = await get_user_by_telegram_id(session, data.telegram_id)
+            user = await get_user_profile(session, data.telegram_id)
             word = await session.get(Word, data.word_id)
             if word is None:
                 raise HTTPException(status_code=404, detail="Слово не найдено")
 
-            new_favorite_word_is_exists = await get_user_favorite_words(session, word.id, user.id)
+            new_favorite_word_is_exists = await favorite_words_store.contains(session, user.id, word.id)
 
             if new_favorite_word_is_exists:
                 raise HTTPException(status_code=201, detail="Данное слово уже добавлено пользователем")
 
-            new_favorite_word = FavoriteWord(
-                user_id=user.id,
-                word_id=word.id
-            )
-            session.add(new_favorite_word)
+            if await insert_favorite_word_if_not_exists(session, user.id, word.id) is None:
+                raise HTTPException(status_code=201, detail="Данное слово уже добавлено пользователем")
             await commit_changes_or_rollback(session, "Ошибка при добавлении слова в избранное")
+            await favorite_words_store.add(user.id, word.id)
+            await exercise_queue.clear(data.telegram_id)
             return {"message": "Слово успешно добавлено в избранное"}
 
     async def delete_favorite_word(self, data: UserFavoriteWord):
@@ -112,8 +99,27 @@ class FavoriteWordManager(BaseManager):
 
             await session.delete(user_favorite_word)
             await commit_changes_or_rollback(session, "Ошибка при удалении слова из избранного")
+            await favorite_words_store.remove(user_favorite_word.user_id, user_favorite_word.word_id)
+            await exercise_queue.clear(data.telegram_id)
             return {"message": "Слово было удалено"}
 
+    async def get_favorite_words(
+            self, telegram_id: int, after_id: Optional[int], size: int,
+            level: Optional[AvailableWordLevel], part_of_speech: Optional[AvailablePartOfSpeech]
+    ) -> FavoriteWordsPage:
+        async with self.session as session:
+            user = await get_user_profile(session, telegram_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="Пользователь не найден")
+            words = await get_user_favorite_words(session, user.id, after_id, size + 1, level, part_of_speech)
+            total = await favorite_words_store.count(session, user.id)
+            next_after_id = words[size - 1].id if len(words) > size else None
+            return FavoriteWordsPage(
+                total=total,
+                next_after_id=next_after_id,
+                words=from_attributes(List[FavoriteWordInfo], words[:size])
+            )
+
 
 class SentenceManager(BaseManager):
 
@@ -131,10 +137,18 @@ class SentenceManager(BaseManager):
 
             new_translation_sentence = TranslationSentence(
                 name=sentence_data.translation_sentence,
+                normalized_name=normalize_sentence(sentence_data.translation_sentence),
+                tokens=tokenize_sentence(sentence_data.translation_sentence),
                 sentence_id=new_sentence.id,
                 from_language_id=sentence_data.translation_from_language.value,
                 to_language_id=sentence_data.translation_to_language.value,
             )
             session.add(new_translation_sentence)
             await commit_changes_or_rollback(session, "Ошибка при добавлении предложения")
+            sentence_pool.add(PoolSentence(
+                new_sentence.id, new_sentence.name, new_sentence.language_id, new_sentence.level,
+                PoolTranslation(new_translation_sentence.id, new_translation_sentence.name, new_sentence.id,
+                                new_translation_sentence.to_language_id),
+                tuple(new_translation_sentence.tokens), new_translation_sentence.normalized_name
+            ))
             return {"message": "Предложение успешно добавлено"}